@@ -1,529 +1,3438 @@
-import os
-import random
-import logging
-import threading
-import curses
-import posix_ipc
-import time
-import argparse
-from datetime import datetime
-
-# Konfiguriere Logging für detaillierte Ausgaben
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Bildschirm löschen
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-# Erstellen einer Nachrichtenwarteschlange
-def create_message_queue(name, max_message_size=1024):
-    try:
-        mq = posix_ipc.MessageQueue(name, flags=posix_ipc.O_CREAT, mode=0o666, max_message_size=max_message_size)
-        return mq
-    except Exception as e:
-        logging.error(f"Fehler beim Erstellen der Nachrichtenwarteschlange: {e}")
-        return None
-
-# Nachricht senden
-def send_message(mq, message):
-    try:
-        mq.send(message.encode())
-        logging.debug(f"Nachricht erfolgreich gesendet: {message}")
-    except posix_ipc.BusyError as e:
-        logging.error(f"Nachrichtenwarteschlange ist voll oder beschäftigt: {e}")
-    except posix_ipc.ExistentialError as e:
-        logging.error(f"Nachrichtenwarteschlange existiert nicht: {e}")
-    except posix_ipc.PermissionError as e:
-        logging.error(f"Berechtigungsfehler beim Senden der Nachricht: {e}")
-    except Exception as e:
-        logging.error(f"Fehler beim Senden der Nachricht: {e}")
-
-# Nachricht empfangen
-def receive_message(mq, message_size=1024):
-    try:
-        message, _ = mq.receive(message_size)
-        return message.decode()
-    except Exception as e:
-        logging.error(f"Fehler beim Empfangen der Nachricht: {e}")
-        return None
-
-# Nachrichtenwarteschlange bereinigen
-def cleanup_message_queue(mq, name):
-    try:
-        mq.close()
-        mq.unlink()
-    except Exception as e:
-        logging.error(f"Fehler beim Bereinigen der Nachrichtenwarteschlange: {e}")
-
-# Warten auf den Gegner
-def wait_for_opponent(mq_name, start_event, init_mq):
-    logging.debug("Warten auf den Beitritt des Gegners...")
-    try:
-        while True:
-            message = receive_message(init_mq)
-            if message == 'start':
-                logging.debug("Startnachricht erhalten.")
-                start_event.set()
-                logging.debug("Start-Event gesetzt, Gegner ist beigetreten.")
-                break
-    except Exception as e:
-        logging.error(f"Fehler im wait_for_opponent: {e}")
-
-# Nachrichten abhören
-def listen_for_messages(mq, game_won_event, game_aborted_event, player_queues, players, log_file):
-    while not game_won_event.is_set() and not game_aborted_event.is_set():
-        try:
-            message = receive_message(mq)
-            if message:
-                logging.debug(f"{message}")
-                if "won" in message:
-                    game_won_event.set()
-                elif "aborted" in message:
-                    game_aborted_event.set()
-                    log_message(log_file, "Abbruch")
-                elif "player joined" in message:
-                    new_player = message.split(":")[1].strip()
-                    if new_player not in players:
-                        players.append(new_player)
-                        for queue in player_queues:
-                            send_message(queue, message)
-        except Exception as e:
-            logging.error(f"Fehler im listen_for_messages: {e}")
-
-# Starten des Nachrichtendienstes
-def start_message_listener(mq_name, game_won_event, game_aborted_event, player_queues, players, log_file):
-    mq = create_message_queue(mq_name)
-    listener_thread = threading.Thread(target=listen_for_messages, args=(mq, game_won_event, game_aborted_event, player_queues, players, log_file))
-    listener_thread.start()
-    return listener_thread
-
-# Erstellen einer Bingokarte
-def create_bingo_card(height, width, words):
-    try:
-        if len(words) < height * width - 1:
-            print("Nicht genügend Wörter in der Wortdatei.")
-            return None
-        random.shuffle(words)
-        card = []
-        for i in range(height):
-            row = []
-            for j in range(width):
-                if (height % 2 != 0 and width % 2 != 0) and (i == height // 2 and j == width // 2):
-                    row.append("JOKER")
-                else:
-                    row.append(words.pop())
-            card.append(row)
-        return card
-    except Exception as e:
-        logging.error(f"Fehler beim Erstellen der Bingokarte: {e}")
-        return None
-
-# Lesen der Bingokarten aus der Rundendatei
-def read_bingo_cards(roundfile):
-    try:
-        with open(roundfile, 'r') as f:
-            lines = f.readlines()
-            height, width = None, None
-            for line in lines:
-                if line.startswith("Height:"):
-                    height = int(line.split(":", 1)[1].strip())
-                elif line.startswith("Width:"):
-                    width = int(line.split(":", 1)[1].strip())
-            if height is None or width is None:
-                print("Höhe oder Breite in der Rundendatei nicht gefunden.")
-                return None
-            wordfile = None
-            for line in lines:
-                if line.startswith("Wordfile:"):
-                    wordfile = line.split(":", 1)[1].strip()
-                    break
-            if wordfile is None:
-                print("Wortdatei in der Rundendatei nicht gefunden.")
-                return None
-            with open(wordfile, 'r') as word_file:
-                words = [line.strip() for line in word_file.readlines()]
-            if len(words) < height * width:
-                print("Nicht genügend Wörter in der Wortdatei.")
-                return None
-            cards = create_bingo_card(height, width, words)
-            return cards
-    except Exception as e:
-        logging.error(f"Fehler beim Lesen der Bingokarten: {e}")
-        return None
-
-# Lesen der Spieler aus der Rundendatei
-def read_players_from_roundfile(roundfile):
-    try:
-        with open(roundfile, 'r') as f:
-            lines = f.readlines()
-        players = [line.split(":", 1)[1].strip() for line in lines if line.startswith("player:")]
-        return players
-    except Exception as e:
-        logging.error(f"Fehler beim Lesen der Spieler aus der Rundendatei: {e}")
-        return []
-
-# Anzeigen der Bingokarten
-def display_bingo_cards(cards, player_name, game_won_event, game_aborted_event, all_player_queues, roundfile):
-    log_file = create_log_file(player_name)
-    log_message(log_file, "Start des Spiels")
-    log_message(log_file, f"Größe des Spielfelds: {len(cards[0])}x{len(cards)}")
-    
-    players = read_players_from_roundfile(roundfile)
-    
-    try:
-        stdscr = curses.initscr()
-        curses.noecho()
-        curses.cbreak()
-        stdscr.keypad(True)
-
-        curses.start_color()
-        curses.init_pair(1, curses.COLOR_MAGENTA, curses.COLOR_BLACK)
-        curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)
-        curses.init_pair(3, curses.COLOR_BLACK, curses.COLOR_WHITE)
-        curses.init_pair(4, curses.COLOR_GREEN, curses.COLOR_BLACK)
-        curses.init_pair(5, curses.COLOR_YELLOW, curses.COLOR_BLACK)
-
-        col_width = 15
-        cursor_idx = (0, 0)
-        selected_indices = {(len(cards) // 2, len(cards[0]) // 2)} if len(cards) % 2 != 0 else set()
-
-        flicker = False
-
-        def toggle_flicker():
-            nonlocal flicker
-            flicker = not flicker
-
-        while not game_won_event.is_set() and not game_aborted_event.is_set():
-            stdscr.clear()
-            stdscr.addstr("Spieler im Spiel:", curses.A_BOLD)
-            for player in players:
-                stdscr.addstr(f"{player},")
-            stdscr.addstr("\n")
-            stdscr.addstr("Rundenname:", curses.A_BOLD)
-            stdscr.addstr(f"{roundfile}")
-            stdscr.addstr("\n")
-            stdscr.addstr("\n")
-            stdscr.addstr("Um das Spiel zu verlassen drücke die `Esc`-Taste auf deinem Keyboard", curses.A_BOLD)
-            stdscr.addstr("\n")
-            stdscr.addstr("\n")
-            stdscr.addstr("\n")
-            stdscr.addstr("\n")
-
-            for row in range(len(cards)):
-                for col in range(len(cards[0])):
-                    word = cards[row][col]
-                    word_to_display = word[:col_width]
-                    padding = " " * (col_width - len(word_to_display))
-                    if (row, col) == cursor_idx:
-                        stdscr.addstr(f"| {word_to_display}{padding} ", curses.color_pair(1))
-                    elif (row, col) in selected_indices:
-                        stdscr.addstr(f"| {word_to_display}{padding} ", curses.color_pair(2) | curses.A_BOLD)
-                    else:
-                        stdscr.addstr(f"| {word_to_display}{padding} ")
-                stdscr.addstr("|\n")
-
-                if row < len(cards) - 1:
-                    stdscr.addstr("+" + ("-" * (col_width + 2) + "+") * len(cards[0]) + "\n")
-
-            stdscr.refresh()
-            key = stdscr.getch()
-            if key == curses.KEY_UP:
-                cursor_idx = (max(cursor_idx[0] - 1, 0), cursor_idx[1])
-            elif key == curses.KEY_DOWN:
-                cursor_idx = (min(cursor_idx[0] + 1, len(cards) - 1), cursor_idx[1])
-            elif key == curses.KEY_RIGHT:
-                cursor_idx = (cursor_idx[0], min(cursor_idx[1] + 1, len(cards[0]) - 1))
-            elif key == curses.KEY_LEFT:
-                cursor_idx = (cursor_idx[0], max(cursor_idx[1] - 1, 0))
-            elif key == 10:  # Enter-Taste zum Auswählen
-                if cursor_idx in selected_indices:
-                    selected_indices.remove(cursor_idx)
-                else:
-                    selected_indices.add(cursor_idx)
-                    log_message(log_file, f"{cards[cursor_idx[0]][cursor_idx[1]]} ({cursor_idx[0]}/{cursor_idx[1]})")
-                if check_win(cards, selected_indices):
-                    if not game_won_event.is_set():
-                        for queue in all_player_queues:
-                            send_message(queue, f"{player_name} won")
-                        game_won_event.set()
-                        log_message(log_file, "Sieg")
-                        logging.debug("Spiel gewonnen, Abbruch der Anzeige.")
-                        with open(roundfile, 'a') as f:
-                            f.write("finished\n")
-                        break
-            elif key == 27:  # Esc-Taste
-                log_message(log_file, "Abbruch")
-                for queue in all_player_queues:
-                    send_message(queue, "Game aborted: Ein Spieler hat das Spiel verlassen, Spiel wird abgebrochen")
-                game_aborted_event.set()
-                with open(roundfile, 'a') as f:
-                    f.write("finished\n")
-                    f.write("Game aborted\n")
-                break
-
-        flicker_start_time = time.time()
-        while time.time() - flicker_start_time < 3 and not game_aborted_event.is_set():
-            stdscr.clear()
-            stdscr.addstr("Spieler im Spiel:\n", curses.A_BOLD)
-            for player in players:
-                stdscr.addstr(f"{player}\n")
-            stdscr.addstr("\n")
-
-            for row in range(len(cards)):
-                for col in range(len(cards[0])):
-                    word = cards[row][col]
-                    word_to_display = word[:col_width]
-                    padding = " " * (col_width - len(word_to_display))
-                    color_pair = 4 if flicker else 5
-                    if (row, col) == cursor_idx:
-                        stdscr.addstr(f"| {word_to_display}{padding} ", curses.color_pair(color_pair))
-                    elif (row, col) in selected_indices:
-                        stdscr.addstr(f"| {word_to_display}{padding} ", curses.color_pair(2) | curses.A_BOLD)
-                    else:
-                        stdscr.addstr(f"| {word_to_display}{padding} ")
-                stdscr.addstr("|\n")
-
-                if row < len(cards) - 1:
-                    stdscr.addstr("+" + ("-" * (col_width + 2) + "+") * len(cards[0]) + "\n")
-
-            stdscr.refresh()
-            time.sleep(0.5)
-            toggle_flicker()
-
-    except Exception as e:
-        logging.error(f"Fehler beim Anzeigen der Bingokarten: {e}")
-    finally:
-        curses.echo()
-        curses.nocbreak()
-        stdscr.keypad(False)
-        curses.endwin()
-        log_message(log_file, "Ende des Spiels")
-
-# Überprüfen, ob ein Spieler gewonnen hat
-def check_win(cards, selected_indices):
-    n = len(cards)
-    for row in range(n):
-        if all((row, col) in selected_indices for col in range(n)):
-            return True
-    for col in range(n):
-        if all((row, col) in selected_indices for row in range(n)):
-            return True
-    if all((i, i) in selected_indices for i in range(n)):
-        return True
-    if all((i, n - 1 - i) in selected_indices for i in range(n)):
-        return True
-    return False
-
-# Überprüfen des Zugangs zur Runde
-def check_access(roundfile, player_name):
-    try:
-        if not os.path.exists(roundfile):
-            print("Spiel nicht gefunden.")
-            return False
-
-        with open(roundfile, 'r') as f:
-            players = f.readlines()
-
-        if any("finished" in line for line in players):
-            print("Spiel ist bereits beendet.")
-            return False
-
-        max_players = int([line.split(":")[1].strip() for line in players if line.startswith("Max")][0])
-        current_players = sum(1 for line in players if line.startswith("player:"))
-        if current_players >= max_players:
-            print("Maximale Anzahl an Spielern erreicht.")
-            return False
-        
-        if any(f"player:{player_name}" == line.strip() for line in players):
-            return False  # Spielername bereits vergeben
-
-        return True
-    except Exception as e:
-        logging.error(f"Fehler bei der Überprüfung des Zugangs: {e}")
-        return False
-
-# Spieler erstellen
-def create_player(roundfile, player_name):
-    try:
-        with open(roundfile, 'a') as f:
-            f.write("player:" + player_name + '\n')
-        print("Spieler erfolgreich erstellt.")
-    except Exception as e:
-        logging.error(f"Fehler beim Erstellen des Spielers: {e}")
-
-# Rundendatei erstellen
-def create_round_file(roundfile, height, width, wordfile, max_players):
-    try:
-        with open(roundfile, 'w') as f:
-            f.write(f"Max: {max_players}\n")
-            f.write(f"Height: {height}\n")
-            f.write(f"Width: {width}\n")
-            f.write(f"Wordfile: {wordfile}\n")
-        print("Rundendatei erfolgreich erstellt.")
-        return True
-    except Exception as e:
-        logging.error(f"Fehler beim Erstellen der Rundendatei: {e}")
-        return False
-
-# Protokolldatei erstellen
-def create_log_file(player_name):
-    current_time = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-    log_folder = os.path.join(os.getcwd(), 'logfiles')
-    os.makedirs(log_folder, exist_ok=True)
-    log_filename = f"{current_time}-bingo-{player_name}.txt"
-    log_filepath = os.path.join(log_folder, log_filename)
-    return log_filepath
-
-# Nachricht in die Protokolldatei schreiben
-def log_message(log_filepath, message):
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_filepath, 'a') as log_file:
-        log_file.write(f"{current_time} {message}\n")
-
-# Benutzerinput erhalten
-def get_input(prompt, input_type=str, valid_range=None, valid_options=None):
-    while True:
-        try:
-            user_input = input_type(input(prompt).strip())
-            if valid_range and user_input not in valid_range:
-                raise ValueError(f"Eingabe muss im Bereich liegen: {valid_range}")
-            if valid_options and user_input not in valid_options:
-                raise ValueError(f"Eingabe muss eine der folgenden Optionen sein: {valid_options}")
-            return user_input
-        except ValueError as e:
-            print(e)
-
-# Argumente parsen
-def parse_arguments():
-    parser = argparse.ArgumentParser(description="Multiplayer Bingo Spiel")
-    parser.add_argument('action', type=str, choices=['create', 'join'], help='Aktion: Spiel erstellen oder beitreten')
-    parser.add_argument('roundfile', type=str, help='Name der Rundendatei')
-    parser.add_argument('player_name', type=str, help='Name des Spielers')
-    parser.add_argument('-x', '--xaxis', type=int, help='Anzahl der Spalten der Bingokarte (erforderlich zum Erstellen)', required=False)
-    parser.add_argument('-y', '--yaxis', type=int, help='Anzahl der Zeilen der Bingokarte (erforderlich zum Erstellen)', required=False)
-    parser.add_argument('-w', '--wordfile', type=str, help='Pfad zur Wortdatei (erforderlich zum Erstellen)', required=False)
-    parser.add_argument('-m', '--max_players', type=int, help='Maximale Anzahl an Spielern (erforderlich zum Erstellen)', required=False)
-    return parser.parse_args()
-
-# Hauptfunktion
-def main():
-    init_mq_name = "/init_queue"
-    init_mq = create_message_queue(init_mq_name, max_message_size=1024)
-    global game_won_event
-    game_won_event = threading.Event()
-    global game_aborted_event
-    game_aborted_event = threading.Event()
-
-    args = parse_arguments()
-
-    try:
-        print("Willkommen zu Multiplayer Bingo!")
-
-        if args.action == 'create':
-            if not all([args.xaxis, args.yaxis, args.wordfile, args.max_players]):
-                print("Zum Erstellen eines Spiels sind die Argumente --xaxis, --yaxis, --wordfile und --max_players erforderlich.")
-                return
-
-            while True:
-                if os.path.exists(args.roundfile):
-                    print("Eine Rundendatei mit diesem Namen existiert bereits. Bitte wähle einen anderen Namen.")
-                    args.roundfile = get_input("Name der Rundendatei: ")
-                else:
-                    break
-
-            height = args.yaxis
-            width = args.xaxis
-            wordfile = args.wordfile
-            max_players = args.max_players
-            player_name = args.player_name
-            roundfile = args.roundfile
-
-            while True:
-                while not os.path.exists(wordfile):
-                    print(f"Datei nicht gefunden: {wordfile}.")
-                    choice = get_input("Möchtest du den Dateipfad erneut eingeben (ja) oder die Standard-Buzzwords-Datei verwenden (nein)? ", str, valid_options={"ja", "nein"})
-                    if choice == "ja":
-                        wordfile = get_input("Bitte gib den Pfad zu deiner Wortdatei ein: ")
-                    else:
-                        wordfile = "buzzwords"  # Ersetze dies durch den Pfad zu deiner Standard-Wortdatei
-                        break
-
-                with open(wordfile, 'r') as word_file:
-                    words = [line.strip() for line in word_file.readlines()]
-
-                if len(words) < height * width:
-                    print(f"Nicht genügend Wörter in der Wortdatei.")
-                    width = get_input("Anzahl der Spalten der Bingokarte: ", int)
-                    height = get_input("Anzahl der Zeilen der Bingokarte: ", int)
-                else:
-                    break
-
-
-            if create_round_file(roundfile, height, width, wordfile, max_players):
-  
-                create_player(roundfile, player_name)
-                mq_name = "/mq_" + player_name
-                create_message_queue(mq_name)
-                print("Warten auf einen anderen Spieler zum Beitreten...")
-                start_event = threading.Event()
-                wait_thread = threading.Thread(target=wait_for_opponent, args=(mq_name, start_event, init_mq))
-                wait_thread.start()
-                start_event.wait()
-                wait_thread.join()
-                print("Ein anderer Spieler ist dem Spiel beigetreten.")
-                cards = read_bingo_cards(roundfile)
-                if cards:
-                    with open(roundfile, 'r') as f:
-                        player_queues = [line.split(":")[1].strip() for line in f if line.startswith("player:")]
-                    all_player_queues = [create_message_queue(f"/mq_{name}") for name in player_queues]
-                    start_message_listener(mq_name, game_won_event, game_aborted_event, all_player_queues, player_queues, create_log_file(player_name))
-                    display_bingo_cards(cards, player_name, game_won_event, game_aborted_event, all_player_queues, roundfile)
-
-                    # Clean up message queues
-                    for queue_name in player_queues:
-                        cleanup_message_queue(create_message_queue(f"/mq_{queue_name}"), f"/mq_{queue_name}")
-                    cleanup_message_queue(init_mq, init_mq_name)
-                    cleanup_message_queue(create_message_queue(mq_name), mq_name)
-
-        elif args.action == 'join':
-            roundfile = args.roundfile
-            player_name = args.player_name
-
-            while not roundfile or not os.path.exists(roundfile):
-                print("Rundendatei nicht gefunden.")
-                roundfile = get_input("Bitte gib den Pfad zur Rundendatei ein: ")
-
-            while not check_access(roundfile, player_name):
-                print("Spielername bereits vergeben.")
-                player_name = get_input("Bitte gib einen anderen Spielernamen ein: ")
-
-            mq_name = "/mq_" + player_name
-            create_message_queue(mq_name)
-            create_player(roundfile, player_name)
-            send_message(posix_ipc.MessageQueue(init_mq_name), 'start')
-            with open(roundfile, 'r') as f:
-                player_queues = [line.split(":")[1].strip() for line in f if line.startswith("player:")]
-            for queue_name in player_queues:
-                send_message(create_message_queue(f"/mq_{queue_name}"), f"player joined: {player_name}")
-            cards = read_bingo_cards(roundfile)
-            if cards:
-                all_player_queues = [create_message_queue(f"/mq_{name}") for name in player_queues]
-                start_message_listener(mq_name, game_won_event, game_aborted_event, all_player_queues, player_queues, create_log_file(player_name))
-                display_bingo_cards(cards, player_name, game_won_event, game_aborted_event, all_player_queues, roundfile)
-
-                # Clean up message queues
-                for queue_name in player_queues:
-                    cleanup_message_queue(create_message_queue(f"/mq_{queue_name}"), f"/mq_{queue_name}")
-                cleanup_message_queue(init_mq, init_mq_name)
-                cleanup_message_queue(create_message_queue(mq_name), mq_name)
-
-        else:
-            print("Ungültige Aktion.")
-            return
-    except Exception as e:
-        logging.error(f"Fehler in der Hauptfunktion: {e}")
-    finally:
-        pass
-
-if __name__ == "__main__":
-    main()
+import os
+import random
+import logging
+import threading
+import curses
+import posix_ipc
+import time
+import argparse
+import select
+import struct
+import sys
+import zlib
+import itertools
+import fcntl
+import mmap
+import hashlib
+from array import array
+import secrets
+import asyncio
+import resource
+import queue
+import atexit
+import tempfile
+import shutil
+import json
+import timeit
+import signal
+import re
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from contextlib import contextmanager
+from collections import namedtuple, Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Konfiguriere Logging; detaillierte Ausgaben nur mit BINGO_DEBUG=1 oder --debug
+logging.basicConfig(level=logging.DEBUG if os.environ.get("BINGO_DEBUG") else logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Maximale Wartezeit der UI-Schleife, bevor Spiel-Events erneut geprüft werden (Sekunden)
+EVENT_LOOP_TIMEOUT = 1.0
+
+# Binäres Nachrichtenprotokoll: Version, Typ, Absender-ID, Runden-ID, Sequenznummer, Nutzdatenlänge
+PROTOCOL_VERSION = 1
+MESSAGE_HEADER = struct.Struct("!BBHIIH")
+MAX_MESSAGE_SIZE = 128
+# Längstes Wort (in Bytes), das noch in eine CALL-Nachricht passt
+MAX_WORD_LENGTH = MAX_MESSAGE_SIZE - MESSAGE_HEADER.size
+
+# Nachrichtentypen
+MSG_START = 1
+MSG_PLAYER_JOINED = 2
+MSG_WON = 3
+MSG_ABORTED = 4
+MSG_JOIN = 5
+MSG_JOIN_ACK = 6
+MSG_ERROR = 7
+MSG_CALL = 8
+MSG_HEARTBEAT = 9
+
+# Absender-ID für Nachrichten ohne Spielerbezug
+NO_SENDER = 0xFFFF
+
+Message = namedtuple("Message", ["type", "sender", "round_id", "seq", "payload"])
+
+_message_seq = itertools.count(1)
+
+# Obergrenzen der Latenz-Buckets in Sekunden (10 µs bis 10 s)
+METRIC_BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0, 10.0)
+DEFAULT_METRICS_INTERVAL = 5.0
+
+# Latenz-Histogramm mit festen Buckets
+class Histogram:
+    def __init__(self, buckets=METRIC_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+# Laufzeitmetriken eines Prozesses, werden periodisch als Prometheus-Text oder JSON geschrieben
+class Metrics:
+    def __init__(self, path, interval=DEFAULT_METRICS_INTERVAL):
+        self.path = path.replace("{pid}", str(os.getpid()))
+        self.interval = interval
+        self.counters = {}
+        self.histograms = {}
+        self.queues = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="Metrics", daemon=True)
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    # Warteschlange registrieren, deren Füllstand bei jedem Schreiben abgefragt wird
+    def watch_queue(self, mq):
+        if mq is not None:
+            with self._lock:
+                self.queues[mq.name] = mq
+
+    def snapshot(self):
+        depths = {}
+        for name, mq in list(self.queues.items()):
+            try:
+                depths[name] = mq.current_messages
+            except Exception:
+                depths[name] = None
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: {"buckets": dict(zip([*map(str, h.buckets), "+Inf"], itertools.accumulate(h.counts))), "sum": h.sum, "count": h.count}
+                               for name, h in self.histograms.items()},
+                "queue_depth": depths,
+            }
+
+    def render_prometheus(self, snapshot):
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            lines += [f"# TYPE {name} counter", f"{name} {value}"]
+        for name, histogram in sorted(snapshot["histograms"].items()):
+            lines.append(f"# TYPE {name} histogram")
+            lines += [f'{name}_bucket{{le="{le}"}} {count}' for le, count in histogram["buckets"].items()]
+            lines += [f"{name}_sum {histogram['sum']}", f"{name}_count {histogram['count']}"]
+        lines.append("# TYPE bingo_queue_depth gauge")
+        lines += [f'bingo_queue_depth{{queue="{name}"}} {depth}' for name, depth in sorted(snapshot["queue_depth"].items()) if depth is not None]
+        return "\n".join(lines) + "\n"
+
+    # Metrikdatei atomar ersetzen
+    def write(self):
+        snapshot = self.snapshot()
+        content = json.dumps(snapshot, indent=2) if self.path.endswith(".json") else self.render_prometheus(snapshot)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(content)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.error(f"Fehler beim Schreiben der Metriken: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.write()
+
+# Globale Metriken; None solange die Instrumentierung ausgeschaltet ist
+METRICS = None
+
+# Instrumentierung einschalten ({pid} im Pfad wird durch die Prozess-ID ersetzt)
+def enable_metrics(path, interval=DEFAULT_METRICS_INTERVAL):
+    global METRICS
+    if METRICS is None:
+        METRICS = Metrics(path, interval)
+        METRICS.start()
+        atexit.register(METRICS.stop)
+    return METRICS
+
+# Bildschirm löschen
+def clear_screen():
+    os.system('cls' if os.name == 'nt' else 'clear')
+
+# Runden-ID aus der Rundendatei lesen; ältere Rundendateien ohne "RoundId:" nutzen den Pfad
+def round_id_for(roundfile):
+    try:
+        round_id = RoundState.load(roundfile).round_id
+    except (OSError, ValueError):
+        round_id = None
+    if round_id is None:
+        round_id = zlib.crc32(os.path.abspath(roundfile).encode())
+    return round_id
+
+# Absender-ID eines Spielers: Position in der Spielerliste der Runde
+def sender_id_for(players, player_name):
+    try:
+        return players.index(player_name)
+    except ValueError:
+        return NO_SENDER
+
+# Neue Nachricht mit fortlaufender Sequenznummer erzeugen
+def make_message(msg_type, sender, round_id, payload=b""):
+    return Message(msg_type, sender, round_id, next(_message_seq) & 0xFFFFFFFF, payload)
+
+# Nachricht in das Binärformat kodieren
+def encode_message(message):
+    if MESSAGE_HEADER.size + len(message.payload) > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Nachricht zu groß: {len(message.payload)} Bytes Nutzdaten")
+    header = MESSAGE_HEADER.pack(PROTOCOL_VERSION, message.type, message.sender, message.round_id, message.seq, len(message.payload))
+    return header + message.payload
+
+# Nachricht aus dem Binärformat dekodieren
+def decode_message(data):
+    if len(data) < MESSAGE_HEADER.size:
+        raise ValueError(f"Nachricht zu kurz: {len(data)} Bytes")
+    version, msg_type, sender, round_id, seq, length = MESSAGE_HEADER.unpack_from(data)
+    if version != PROTOCOL_VERSION:
+        raise ValueError(f"Unbekannte Protokollversion: {version}")
+    payload = bytes(data[MESSAGE_HEADER.size:MESSAGE_HEADER.size + length])
+    if len(payload) != length:
+        raise ValueError("Nutzdaten unvollständig")
+    return Message(msg_type, sender, round_id, seq, payload)
+
+# Mehrere Textfelder in eine Nutzlast packen bzw. daraus lesen
+def pack_fields(*fields):
+    return b"\0".join(str(field).encode() for field in fields)
+
+def unpack_fields(payload):
+    return [field.decode() for field in payload.split(b"\0")] if payload else []
+
+# Verzeichnis mit Besitzer-Einträgen (PID, Rundendatei) für die Warteschlangen und Anzeigetafeln dieses Rechners
+QUEUE_OWNER_DIR = os.path.join(tempfile.gettempdir(), "bingo-queues")
+
+# Präfixe der Warteschlangen, die zu diesem Spiel gehören
+BINGO_QUEUE_PREFIXES = ("/mq_", "/bingo_lobby_", "/bingo_bench_", "/init_queue")
+
+# Präfix der Anzeigetafeln (Shared Memory und Semaphore gleichen Namens)
+SCOREBOARD_PREFIX = "/bingo_board_"
+
+def _queue_owner_path(name):
+    return os.path.join(QUEUE_OWNER_DIR, name.lstrip("/"))
+
+# Besitzer-Eintrag schreiben, damit der Reaper verwaiste IPC-Objekte erkennt
+def _write_owner_record(name, roundfile):
+    try:
+        os.makedirs(QUEUE_OWNER_DIR, exist_ok=True)
+        with open(_queue_owner_path(name), 'w') as f:
+            json.dump({"pid": os.getpid(), "roundfile": os.path.abspath(roundfile), "created": time.time()}, f)
+    except OSError as e:
+        logging.error(f"Fehler beim Speichern des Besitzer-Eintrags: {e}")
+
+def _remove_owner_record(name):
+    try:
+        os.unlink(_queue_owner_path(name))
+    except FileNotFoundError:
+        pass
+
+# Prozessweites Register: jede Warteschlange wird nur einmal geöffnet und beim Beenden geschlossen
+class QueueRegistry:
+    def __init__(self):
+        self._queues = {}
+        self._owned = set()
+        self._lock = threading.Lock()
+
+    def get(self, name, max_message_size=MAX_MESSAGE_SIZE):
+        with self._lock:
+            mq = self._queues.get(name)
+            if mq is None:
+                mq = self._queues[name] = posix_ipc.MessageQueue(name, flags=posix_ipc.O_CREAT, mode=0o666, max_message_size=max_message_size)
+            return mq
+
+    # Eigene Warteschlange mit Besitzer-Eintrag versehen, damit der Reaper verwaiste Queues erkennt
+    def claim(self, name, roundfile):
+        _write_owner_record(name, roundfile)
+        with self._lock:
+            self._owned.add(name)
+
+    # Handle schließen und optional die Warteschlange im System löschen
+    def release(self, name, unlink=False):
+        with self._lock:
+            mq = self._queues.pop(name, None)
+            owned = name in self._owned
+            self._owned.discard(name)
+        if mq is not None:
+            try:
+                mq.close()
+            except posix_ipc.ExistentialError:
+                pass
+        if unlink:
+            try:
+                posix_ipc.unlink_message_queue(name)
+            except posix_ipc.ExistentialError:
+                pass
+        if unlink or owned:
+            _remove_owner_record(name)
+
+    # Alle Handles schließen; eigene Warteschlangen werden dabei gelöscht
+    def close_all(self):
+        with self._lock:
+            names = list(self._queues)
+            owned = set(self._owned)
+        for name in names:
+            self.release(name, unlink=name in owned)
+        for name in owned - set(names):
+            self.release(name, unlink=True)
+
+QUEUES = QueueRegistry()
+atexit.register(QUEUES.close_all)
+
+# Bei SIGTERM/SIGHUP regulär beenden, damit finally-Blöcke und atexit die Warteschlangen aufräumen
+def install_signal_handlers():
+    def _exit(signum, frame):
+        raise SystemExit(128 + signum)
+    for signum in (signal.SIGTERM, signal.SIGHUP):
+        signal.signal(signum, _exit)
+
+# Erstellen einer Nachrichtenwarteschlange (bzw. bereits geöffnetes Handle aus dem Register)
+def create_message_queue(name, max_message_size=MAX_MESSAGE_SIZE):
+    try:
+        return QUEUES.get(name, max_message_size)
+    except Exception as e:
+        logging.error(f"Fehler beim Erstellen der Nachrichtenwarteschlange: {e}")
+        return None
+
+# Nachricht senden, mit timeout=0 nicht-blockierend; gibt zurück ob die Nachricht zugestellt wurde
+def send_message(mq, message, timeout=None):
+    try:
+        if METRICS is not None:
+            start = time.perf_counter()
+            mq.send(encode_message(message), timeout)
+            METRICS.observe("bingo_send_seconds", time.perf_counter() - start)
+        else:
+            mq.send(encode_message(message), timeout)
+        logging.debug("Nachricht erfolgreich gesendet: %s", message)
+        return True
+    except posix_ipc.BusyError as e:
+        logging.error(f"Nachrichtenwarteschlange ist voll oder beschäftigt: {e}")
+    except posix_ipc.ExistentialError as e:
+        logging.error(f"Nachrichtenwarteschlange existiert nicht: {e}")
+    except posix_ipc.PermissionError as e:
+        logging.error(f"Berechtigungsfehler beim Senden der Nachricht: {e}")
+    except Exception as e:
+        logging.error(f"Fehler beim Senden der Nachricht: {e}")
+    return False
+
+# Zustellungsergebnisse pro Empfänger beim Broadcast
+DELIVERY_OK = "ok"
+DELIVERY_FULL = "full"
+DELIVERY_GONE = "gone"
+DELIVERY_ERROR = "error"
+
+# Wiederholungen für volle Warteschlangen; die Wartezeit verdoppelt sich pro Runde
+BROADCAST_RETRIES = 3
+BROADCAST_RETRY_DELAY = 0.02
+
+# Bereits kodierte Nachricht nicht-blockierend zustellen
+def _try_send(mq, data):
+    if mq is None:
+        return DELIVERY_GONE
+    try:
+        if METRICS is not None:
+            start = time.perf_counter()
+            mq.send(data, 0)
+            METRICS.observe("bingo_send_seconds", time.perf_counter() - start)
+        else:
+            mq.send(data, 0)
+        return DELIVERY_OK
+    except posix_ipc.BusyError:
+        return DELIVERY_FULL
+    except posix_ipc.ExistentialError:
+        return DELIVERY_GONE
+    except Exception as e:
+        logging.error(f"Fehler beim Senden der Nachricht an {mq.name}: {e}")
+        return DELIVERY_ERROR
+
+# Nachricht an alle Warteschlangen senden, ohne auf langsame Empfänger zu blockieren.
+# Volle Warteschlangen werden begrenzt oft erneut versucht, die Gesamtdauer hängt damit
+# nicht vom langsamsten Empfänger ab. Gibt das Zustellungsergebnis pro Warteschlange zurück.
+def broadcast_message(queues, message, retries=BROADCAST_RETRIES, retry_delay=BROADCAST_RETRY_DELAY):
+    try:
+        data = encode_message(message)
+    except ValueError as e:
+        logging.error(f"Fehler beim Kodieren der Nachricht: {e}")
+        return {}
+    results = {}
+    pending = list(queues)
+    for attempt in range(retries + 1):
+        still_full = []
+        for index, mq in enumerate(pending):
+            status = _try_send(mq, data)
+            results[mq.name if mq is not None else f"#{index}"] = status
+            if status == DELIVERY_FULL:
+                still_full.append(mq)
+        pending = still_full
+        if not pending or attempt == retries:
+            break
+        time.sleep(retry_delay * (2 ** attempt))
+    failed = {name: status for name, status in results.items() if status != DELIVERY_OK}
+    if failed:
+        logging.error(f"Nachricht nicht an alle Spieler zugestellt: {failed}")
+    else:
+        logging.debug("Nachricht an %d Warteschlangen gesendet: %s", len(results), message)
+    return results
+
+# Nachricht empfangen, mit timeout=0 nicht-blockierend
+def receive_message(mq, timeout=None):
+    try:
+        if METRICS is not None:
+            start = time.perf_counter()
+            message, _ = mq.receive(timeout)
+            METRICS.observe("bingo_receive_seconds", time.perf_counter() - start)
+        else:
+            message, _ = mq.receive(timeout)
+        return decode_message(message)
+    except posix_ipc.BusyError:
+        return None
+    except Exception as e:
+        logging.error(f"Fehler beim Empfangen der Nachricht: {e}")
+        if METRICS is not None:
+            METRICS.inc("bingo_receive_errors_total")
+        return None
+
+# Nachrichtenwarteschlange bereinigen
+def cleanup_message_queue(mq, name):
+    try:
+        QUEUES.release(name, unlink=True)
+    except Exception as e:
+        logging.error(f"Fehler beim Bereinigen der Nachrichtenwarteschlange: {e}")
+
+# Prüfen, ob ein Prozess noch läuft
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+# Bingo-Warteschlangen des Systems auflisten (/dev/mqueue, falls eingehängt, und Besitzer-Einträge)
+def list_bingo_queues():
+    names = set()
+    for directory in ("/dev/mqueue", QUEUE_OWNER_DIR):
+        if os.path.isdir(directory):
+            names.update("/" + entry for entry in os.listdir(directory))
+    return sorted(name for name in names if name.startswith(BINGO_QUEUE_PREFIXES))
+
+# Anzeigetafeln des Systems auflisten (/dev/shm enthält Segmente und Semaphoren als "sem.<Name>")
+def list_bingo_scoreboards():
+    names = set()
+    if os.path.isdir("/dev/shm"):
+        names.update("/" + (entry[len("sem."):] if entry.startswith("sem.") else entry) for entry in os.listdir("/dev/shm"))
+    if os.path.isdir(QUEUE_OWNER_DIR):
+        names.update("/" + entry for entry in os.listdir(QUEUE_OWNER_DIR))
+    return sorted(name for name in names if name.startswith(SCOREBOARD_PREFIX))
+
+def _unlink_queue(name):
+    try:
+        posix_ipc.unlink_message_queue(name)
+    except posix_ipc.ExistentialError:
+        pass
+
+# Segment und Semaphore einer Anzeigetafel im System löschen
+def unlink_scoreboard(name):
+    for unlink in (posix_ipc.unlink_shared_memory, posix_ipc.unlink_semaphore):
+        try:
+            unlink(name)
+        except posix_ipc.ExistentialError:
+            pass
+
+# Grund, warum eine Warteschlange oder Anzeigetafel verwaist ist, oder None wenn sie (vermutlich) noch gebraucht wird
+def orphan_reason(name):
+    try:
+        with open(_queue_owner_path(name)) as f:
+            record = json.load(f)
+    except FileNotFoundError:
+        if name == "/init_queue":
+            return "globale Start-Warteschlange älterer Versionen"
+        return None
+    except (OSError, ValueError):
+        return "Besitzer-Eintrag unlesbar"
+    if not _process_alive(record.get("pid", 0)):
+        return f"Besitzer-Prozess {record.get('pid')} läuft nicht mehr"
+    roundfile = record.get("roundfile")
+    if not roundfile or not os.path.exists(roundfile):
+        return "Rundendatei existiert nicht mehr"
+    try:
+        if RoundState.load(roundfile).finished:
+            return "Runde ist beendet"
+    except Exception:
+        return "Rundendatei unlesbar"
+    return None
+
+# Verwaiste Warteschlangen und Anzeigetafeln finden und löschen; mit force auch solche ohne Besitzer-Eintrag
+def reap_queues(dry_run=False, force=False):
+    reaped = []
+    candidates = [(name, _unlink_queue) for name in list_bingo_queues()] + [(name, unlink_scoreboard) for name in list_bingo_scoreboards()]
+    for name, unlink in candidates:
+        reason = orphan_reason(name)
+        if reason is None and force and not os.path.exists(_queue_owner_path(name)):
+            reason = "kein Besitzer-Eintrag"
+        if reason is None:
+            logging.debug("%s wird noch verwendet.", name)
+            continue
+        print(f"{name}: {reason}" + (" (nicht gelöscht)" if dry_run else ""))
+        if not dry_run:
+            unlink(name)
+            _remove_owner_record(name)
+        reaped.append(name)
+    boards = sum(name.startswith(SCOREBOARD_PREFIX) for name in reaped)
+    print(f"{len(reaped) - boards} verwaiste Warteschlange(n) und {boards} verwaiste Anzeigetafel(n) gefunden.")
+    return reaped
+
+# Standardwerte der Lobby: Mindestanzahl an Spielern und maximale Wartezeit in Sekunden
+DEFAULT_MIN_PLAYERS = 2
+DEFAULT_LOBBY_TIMEOUT = 300.0
+
+# Name der Lobby-Warteschlange einer Runde
+def lobby_queue_name(roundfile):
+    return f"/bingo_lobby_{round_id_for(roundfile):08x}"
+
+# Treffpunkt einer einzelnen Runde: Beitretende melden sich über die Lobby-Warteschlange der Runde
+class RoundLobby:
+    def __init__(self, roundfile):
+        self.roundfile = roundfile
+        self.name = lobby_queue_name(roundfile)
+        self.round_id = round_id_for(roundfile)
+        self.mq = None
+
+    # Lobby für die Runde anlegen (Ersteller)
+    def open(self):
+        self.mq = create_message_queue(self.name)
+        if self.mq is not None:
+            QUEUES.claim(self.name, self.roundfile)
+        return self.mq is not None
+
+    # Beitritt melden (Beitretende); fehlt die Lobby, wartet niemand mehr und die Meldung entfällt
+    def announce(self, sender_id):
+        try:
+            mq = posix_ipc.MessageQueue(self.name)
+        except posix_ipc.ExistentialError:
+            logging.debug("Keine Lobby für diese Runde, Startmeldung entfällt.")
+            return False
+        try:
+            return send_message(mq, make_message(MSG_START, sender_id, self.round_id), timeout=0)
+        finally:
+            mq.close()
+
+    # Warten, bis mindestens min_players in der Runde sind; gibt False bei Zeitüberschreitung,
+    # Abbruch oder Fehler zurück. Beitretende warten auf ihrer eigenen Warteschlange (mq).
+    def wait_for_players(self, min_players, timeout, mq=None):
+        mq = mq or self.mq
+        deadline = time.monotonic() + timeout
+        logging.debug("Warten auf den Beitritt der Mitspieler...")
+        while len(RoundState.load(self.roundfile).players) < min_players:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                data, _ = mq.receive(remaining)
+                message = decode_message(data)
+                if message.type == MSG_ABORTED and message.round_id == self.round_id:
+                    return False
+                if message.type not in (MSG_START, MSG_PLAYER_JOINED) or message.round_id != self.round_id:
+                    logging.debug("Unerwartete Nachricht in der Lobby ignoriert: %s", message)
+            except posix_ipc.BusyError:
+                return len(RoundState.load(self.roundfile).players) >= min_players
+            except ValueError as e:
+                logging.error(f"Ungültige Nachricht in der Lobby: {e}")
+            except Exception as e:
+                logging.error(f"Fehler beim Warten in der Lobby: {e}")
+                return False
+        logging.debug("Mindestanzahl an Spielern erreicht.")
+        return True
+
+    def close(self):
+        if self.mq is not None:
+            cleanup_message_queue(self.mq, self.name)
+            self.mq = None
+
+# Anzeigetafel einer Runde im gemeinsamen Speicher: Kopf (Magic, Höhe, Breite, Spielerzahl, Runden-ID)
+# gefolgt von einem Slot fester Größe pro Spieler (Reihenfolge wie in der Rundendatei)
+SCOREBOARD_MAGIC = b"BSCORE01"
+SCOREBOARD_HEADER = struct.Struct("=8sHHHxxI")
+# Slot: Name, Status, Sequenznummer (ungerade während geschrieben wird), Zeitpunkt der letzten Änderung;
+# danach folgt die Bitmaske der markierten Zellen
+SCOREBOARD_SLOT = struct.Struct("=32sBxxxId")
+
+# Maximale Wartezeit auf die Semaphore, damit ein abgestürzter Schreiber niemanden blockiert (Sekunden)
+SCOREBOARD_LOCK_TIMEOUT = 1.0
+SCOREBOARD_READ_RETRIES = 100
+
+# Status eines Slots
+SLOT_EMPTY = 0
+SLOT_PLAYING = 1
+SLOT_WON = 2
+SLOT_ABORTED = 3
+SLOT_DONE = 4
+
+SLOT_LABELS = {
+    SLOT_EMPTY: "-",
+    SLOT_PLAYING: "spielt",
+    SLOT_WON: "gewonnen",
+    SLOT_ABORTED: "abgebrochen",
+    SLOT_DONE: "beendet",
+}
+
+def scoreboard_name(roundfile):
+    return f"{SCOREBOARD_PREFIX}{round_id_for(roundfile):08x}"
+
+# Spieler schreiben ihren eigenen Slot unter der Semaphore direkt in den Speicher; Leser (watch)
+# lesen ohne Sperre und ohne Nachrichten und erkennen halb geschriebene Slots an der Sequenznummer
+class Scoreboard:
+    def __init__(self, name, shm, semaphore, writable, owner=False):
+        self.name = name
+        self.semaphore = semaphore
+        self.owner = owner
+        prot = mmap.PROT_READ | mmap.PROT_WRITE if writable else mmap.PROT_READ
+        self.buffer = mmap.mmap(shm.fd, shm.size, prot=prot)
+        shm.close_fd()
+        self.view = memoryview(self.buffer)
+
+    def _read_header(self):
+        magic, self.height, self.width, self.max_players, self.round_id = SCOREBOARD_HEADER.unpack_from(self.buffer)
+        if magic != SCOREBOARD_MAGIC:
+            raise ValueError("Ungültige Anzeigetafel")
+        self.bitmap_size = (self.height * self.width + 7) // 8
+        # Slots auf 8 Byte ausrichten
+        self.slot_size = (SCOREBOARD_SLOT.size + self.bitmap_size + 7) & ~7
+
+    @staticmethod
+    def segment_size(height, width, max_players):
+        slot_size = (SCOREBOARD_SLOT.size + (height * width + 7) // 8 + 7) & ~7
+        return SCOREBOARD_HEADER.size + max_players * slot_size
+
+    # Anzeigetafel für eine neue Runde anlegen (Ersteller); wird beim Beenden wieder gelöscht
+    @classmethod
+    def create(cls, roundfile, height, width, max_players):
+        name = scoreboard_name(roundfile)
+        try:
+            shm = posix_ipc.SharedMemory(name, posix_ipc.O_CREAT, mode=0o644, size=cls.segment_size(height, width, max_players))
+            semaphore = posix_ipc.Semaphore(name, posix_ipc.O_CREAT, mode=0o666, initial_value=1)
+            board = cls(name, shm, semaphore, writable=True, owner=True)
+            SCOREBOARD_HEADER.pack_into(board.buffer, 0, SCOREBOARD_MAGIC, height, width, max_players, round_id_for(roundfile))
+            board._read_header()
+            _write_owner_record(name, roundfile)
+            atexit.register(board.close)
+            return board
+        except Exception as e:
+            logging.error(f"Fehler beim Anlegen der Anzeigetafel: {e}")
+            return None
+
+    # Bestehende Anzeigetafel öffnen; fehlt sie, gibt es für diese Runde keine
+    @classmethod
+    def attach(cls, roundfile, writable=True):
+        name = scoreboard_name(roundfile)
+        try:
+            shm = posix_ipc.SharedMemory(name, read_only=not writable)
+            semaphore = posix_ipc.Semaphore(name) if writable else None
+            board = cls(name, shm, semaphore, writable)
+            board._read_header()
+            return board
+        except posix_ipc.ExistentialError:
+            logging.debug("Keine Anzeigetafel für diese Runde.")
+            return None
+        except Exception as e:
+            logging.error(f"Fehler beim Öffnen der Anzeigetafel: {e}")
+            return None
+
+    def slot_offset(self, slot):
+        return SCOREBOARD_HEADER.size + slot * self.slot_size
+
+    # Eigenen Slot aktualisieren: Sequenznummer ungerade setzen, schreiben, dann wieder gerade
+    def publish(self, slot, player_name, status, mask):
+        if not 0 <= slot < self.max_players:
+            return False
+        try:
+            self.semaphore.acquire(SCOREBOARD_LOCK_TIMEOUT)
+        except posix_ipc.BusyError:
+            logging.error("Anzeigetafel ist gesperrt, Aktualisierung übersprungen.")
+            return False
+        try:
+            offset = self.slot_offset(slot)
+            _, _, seq, _ = SCOREBOARD_SLOT.unpack_from(self.buffer, offset)
+            # Nach einem abgebrochenen Schreibvorgang kann die Nummer noch ungerade sein
+            seq = (seq + (2 if seq & 1 else 1)) & 0xFFFFFFFF
+            name = player_name.encode()[:32]
+            SCOREBOARD_SLOT.pack_into(self.buffer, offset, name, status, seq, time.time())
+            start = offset + SCOREBOARD_SLOT.size
+            self.buffer[start:start + self.bitmap_size] = mask.to_bytes(self.bitmap_size, 'little')
+            SCOREBOARD_SLOT.pack_into(self.buffer, offset, name, status, (seq + 1) & 0xFFFFFFFF, time.time())
+            return True
+        finally:
+            self.semaphore.release()
+
+    # Sequenznummern aller Slots, um Änderungen ohne Lesen der Bitmasken zu erkennen
+    def sequences(self):
+        return tuple(SCOREBOARD_SLOT.unpack_from(self.buffer, self.slot_offset(slot))[2] for slot in range(self.max_players))
+
+    # Slot konsistent lesen, gibt (Name, Status, Sequenz, Zeitpunkt, Bitmaske) oder None für leere Slots zurück.
+    # Ändert sich die Sequenznummer während des Lesens, wird es wiederholt (höchstens SCOREBOARD_READ_RETRIES Mal).
+    def read(self, slot):
+        offset = self.slot_offset(slot)
+        start = offset + SCOREBOARD_SLOT.size
+        for _ in range(SCOREBOARD_READ_RETRIES):
+            name, status, seq, updated = SCOREBOARD_SLOT.unpack_from(self.buffer, offset)
+            mask = int.from_bytes(self.view[start:start + self.bitmap_size], 'little')
+            if not seq & 1 and SCOREBOARD_SLOT.unpack_from(self.buffer, offset)[2] == seq:
+                break
+            time.sleep(0)
+        if status == SLOT_EMPTY:
+            return None
+        return name.rstrip(b"\0").decode(errors='replace'), status, seq, updated, mask
+
+    # Speicher freigeben; der Ersteller löscht Segment und Semaphore im System
+    def close(self):
+        if self.buffer is None:
+            return
+        self.view.release()
+        self.buffer.close()
+        self.buffer = None
+        if self.semaphore is not None:
+            self.semaphore.close()
+        if self.owner:
+            unlink_scoreboard(self.name)
+            _remove_owner_record(self.name)
+
+# Zustand, auf den die Nachrichten-Handler zugreifen. Die Anzeige setzt zusätzlich die Rundendatei,
+# on_call, das ein aufgerufenes Wort über den Wortindex auf der eigenen Karte markiert, und den
+# FailureDetector, der jede Nachricht eines Mitspielers als Lebenszeichen vermerkt.
+class MessageContext:
+    def __init__(self, game_won_event, game_aborted_event, player_queues, players, log_file, round_id=None,
+                 roundfile=None, caller_mode=False, on_call=None, player_name=None, detector=None):
+        self.game_won_event = game_won_event
+        self.game_aborted_event = game_aborted_event
+        self.player_queues = player_queues
+        self.players = players
+        self.log_file = log_file
+        self.round_id = round_id
+        self.roundfile = roundfile
+        self.caller_mode = caller_mode
+        self.on_call = on_call
+        self.player_name = player_name
+        self.detector = detector
+
+    # Absender als lebendig vermerken; Absender-IDs sind Positionen in der Spielerliste der Rundendatei
+    def seen(self, message):
+        if self.detector is None or message.sender == NO_SENDER:
+            return
+        senders = RoundState.load(self.roundfile).players if self.roundfile else self.players
+        if message.sender < len(senders):
+            self.detector.seen(senders[message.sender])
+
+# Ein anderer Spieler hat gewonnen; in Runden mit Ausrufer zählt nur ein Sieg mit Eintrag in der Rundendatei
+def _handle_won(message, context):
+    if context.caller_mode and RoundState.load(context.roundfile).winner is None:
+        logging.error("Unbestätigte Siegmeldung ignoriert.")
+        return False
+    context.game_won_event.set()
+    return False
+
+# Ein Spieler hat das Spiel abgebrochen
+def _handle_aborted(message, context):
+    context.game_aborted_event.set()
+    log_message(context.log_file, "Abbruch")
+    flush_log(context.log_file)
+    return False
+
+# Ein neuer Spieler ist beigetreten: in die Empfängerliste aufnehmen und die Nachricht an alle weiterleiten
+def _handle_player_joined(message, context):
+    new_player = message.payload.decode()
+    if new_player in context.players:
+        return False
+    context.players.append(new_player)
+    if context.detector is not None and new_player != context.player_name:
+        context.detector.add(new_player)
+    queue_name = f"/mq_{new_player}"
+    if all(queue is None or queue.name != queue_name for queue in context.player_queues):
+        new_queue = create_message_queue(queue_name)
+        if new_queue is not None:
+            context.player_queues.append(new_queue)
+    broadcast_message(context.player_queues, message)
+    return True
+
+# Aufgerufenes Wort; nur in Runden mit Ausrufer auf der eigenen Karte markieren
+def _handle_call(message, context):
+    word = message.payload.decode(errors='replace')
+    logging.debug("Aufgerufen: %s", word)
+    if context.caller_mode and context.on_call is not None:
+        context.on_call(word)
+    return False
+
+MESSAGE_HANDLERS = {
+    MSG_WON: _handle_won,
+    MSG_ABORTED: _handle_aborted,
+    MSG_PLAYER_JOINED: _handle_player_joined,
+    MSG_CALL: _handle_call,
+}
+
+# Eine empfangene Nachricht verarbeiten, gibt zurück ob sich die Spielerliste geändert hat
+def handle_message(message, context):
+    logging.debug("%s", message)
+    if context.round_id is not None and message.round_id != context.round_id:
+        logging.debug("Nachricht einer anderen Runde ignoriert.")
+        return False
+    context.seen(message)
+    # Lebenszeichen tragen außer der Anwesenheit des Absenders nichts
+    if message.type == MSG_HEARTBEAT:
+        return False
+    handler = MESSAGE_HANDLERS.get(message.type)
+    if handler is None:
+        logging.error(f"Unbekannter Nachrichtentyp: {message.type}")
+        return False
+    return handler(message, context)
+
+# Nachrichten abhören; das Empfangen hat ein Timeout, damit der Thread nach Spielende immer endet
+def listen_for_messages(mq, game_won_event, game_aborted_event, player_queues, players, log_file, round_id=None, detector=None):
+    context = MessageContext(game_won_event, game_aborted_event, player_queues, players, log_file, round_id, detector=detector)
+    while not game_won_event.is_set() and not game_aborted_event.is_set():
+        if METRICS is not None:
+            METRICS.inc("bingo_listener_iterations_total")
+        try:
+            message = receive_message(mq, EVENT_LOOP_TIMEOUT)
+            if message:
+                handle_message(message, context)
+        except Exception as e:
+            logging.error(f"Fehler im listen_for_messages: {e}")
+            if METRICS is not None:
+                METRICS.inc("bingo_listener_errors_total")
+
+# Starten des Nachrichtendienstes
+def start_message_listener(mq_name, game_won_event, game_aborted_event, player_queues, players, log_file, round_id=None, detector=None):
+    mq = create_message_queue(mq_name)
+    listener_thread = threading.Thread(target=listen_for_messages, args=(mq, game_won_event, game_aborted_event, player_queues, players, log_file, round_id, detector), daemon=True)
+    listener_thread.start()
+    return listener_thread
+
+# Lebenszeichen: Intervall in Sekunden und Anzahl verpasster Intervalle, nach denen ein Spieler als verschwunden gilt
+DEFAULT_HEARTBEAT_INTERVAL = 2.0
+DEFAULT_HEARTBEAT_MISSES = 3
+
+# Verhalten, wenn ein Spieler verschwindet: weiterspielen oder die Runde abbrechen
+PLAYER_GONE_CONTINUE = "continue"
+PLAYER_GONE_ABORT = "abort"
+
+# Fehlerdetektor: jede Nachricht eines Spielers zählt als Lebenszeichen. Wer länger als
+# interval * misses Sekunden schweigt, gilt endgültig als verschwunden.
+class FailureDetector:
+    def __init__(self, players, interval=DEFAULT_HEARTBEAT_INTERVAL, misses=DEFAULT_HEARTBEAT_MISSES, clock=time.monotonic):
+        self.timeout = interval * misses
+        self.clock = clock
+        self.lock = threading.Lock()
+        now = clock()
+        self.last_seen = {name: now for name in players}
+        self.gone = set()
+
+    # Neuen Spieler aufnehmen; er hat ab jetzt die volle Frist
+    def add(self, name):
+        with self.lock:
+            self.last_seen.setdefault(name, self.clock())
+
+    def seen(self, name):
+        with self.lock:
+            if name in self.last_seen and name not in self.gone:
+                self.last_seen[name] = self.clock()
+
+    # Schweigende Spieler als verschwunden markieren, gibt die neu verschwundenen zurück
+    def check(self):
+        deadline = self.clock() - self.timeout
+        with self.lock:
+            newly_gone = [name for name, last in self.last_seen.items() if last < deadline and name not in self.gone]
+            self.gone.update(newly_gone)
+        return newly_gone
+
+# Wortkorpus über mmap mit dedupliziertem Zeilen-Offset-Index, der auf der Platte zwischengespeichert wird
+class WordCorpus:
+    INDEX_MAGIC = b"BWIDX002"
+    # Verzeichnis der Index-Dateien; None heißt .wordindex im aktuellen Arbeitsverzeichnis
+    index_root = None
+    _open_corpora = {}
+    _open_lock = threading.Lock()
+
+    def __init__(self, wordfile):
+        self.wordfile = wordfile
+        self._file = open(wordfile, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.file_hash = hashlib.sha1(self._mm).hexdigest()
+        self.offsets, self.lengths = self._load_or_build_index()
+
+    # Geöffneten Korpus wiederverwenden, solange sich die Wortdatei nicht ändert
+    @classmethod
+    def open(cls, wordfile):
+        path = os.path.abspath(wordfile)
+        st = os.stat(path)
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with cls._open_lock:
+            cached = cls._open_corpora.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            corpus = cls(path)
+            cls._open_corpora[path] = (key, corpus)
+            return corpus
+
+    @classmethod
+    def index_dir(cls):
+        return cls.index_root or os.path.join(os.getcwd(), '.wordindex')
+
+    def index_path(self):
+        return os.path.join(self.index_dir(), f"{self.file_hash}.idx")
+
+    # Index einmalig aufbauen: Offset und Länge jedes eindeutigen, nicht-leeren Worts. Wörter über
+    # MAX_WORD_LENGTH kommen nicht in den Index, da der Ausrufer sie nicht verschicken könnte.
+    def _build_index(self):
+        offsets = array('Q')
+        lengths = array('I')
+        seen = set()
+        mm = self._mm
+        size = len(mm)
+        pos = 0
+        while pos < size:
+            end = mm.find(b"\n", pos)
+            if end == -1:
+                end = size
+            line = mm[pos:end]
+            word = line.strip()
+            if word and len(word) <= MAX_WORD_LENGTH and word not in seen:
+                seen.add(word)
+                offsets.append(pos + line.index(word[:1]))
+                lengths.append(len(word))
+            pos = end + 1
+        return offsets, lengths
+
+    def _load_or_build_index(self):
+        path = self.index_path()
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(self.INDEX_MAGIC)) == self.INDEX_MAGIC:
+                    count = int.from_bytes(f.read(8), 'little')
+                    offsets = array('Q')
+                    lengths = array('I')
+                    offsets.fromfile(f, count)
+                    lengths.fromfile(f, count)
+                    return offsets, lengths
+        except (OSError, EOFError):
+            pass
+        offsets, lengths = self._build_index()
+        try:
+            os.makedirs(self.index_dir(), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(self.INDEX_MAGIC)
+                f.write(len(offsets).to_bytes(8, 'little'))
+                offsets.tofile(f)
+                lengths.tofile(f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.error(f"Fehler beim Speichern des Wortindex: {e}")
+        return offsets, lengths
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def word(self, index):
+        offset = self.offsets[index]
+        return self._mm[offset:offset + self.lengths[index]].decode()
+
+    # k verschiedene Wörter ziehen, ohne den ganzen Korpus zu lesen oder zu mischen
+    def sample(self, k, rng=random):
+        return [self.word(index) for index in rng.sample(range(len(self)), k)]
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+# Anzahl benötigter Wörter für eine Karte (das Mittelfeld ist bei ungeraden Maßen ein Joker)
+def words_needed(height, width):
+    has_joker = height % 2 != 0 and width % 2 != 0
+    return height * width - 1 if has_joker else height * width
+
+# Erstellen einer Bingokarte aus einer Wortliste oder einem WordCorpus
+def create_bingo_card(height, width, words):
+    try:
+        needed = words_needed(height, width)
+        if len(words) < needed:
+            print("Nicht genügend Wörter in der Wortdatei.")
+            return None
+        drawn = words.sample(needed) if isinstance(words, WordCorpus) else random.sample(words, needed)
+        drawn.reverse()
+        card = []
+        for i in range(height):
+            row = []
+            for j in range(width):
+                if (height % 2 != 0 and width % 2 != 0) and (i == height // 2 and j == width // 2):
+                    row.append("JOKER")
+                else:
+                    row.append(drawn.pop())
+            card.append(row)
+        return card
+    except Exception as e:
+        logging.error(f"Fehler beim Erstellen der Bingokarte: {e}")
+        return None
+
+# Maximale Anzahl an Versuchen, Karten mit zu großer Überschneidung neu zu ziehen
+CARD_GENERATION_ATTEMPTS = 200
+
+# Zufällige Zeilen aus k verschiedenen Korpus-Indizes ziehen (NumPy, vektorisiert)
+def _numpy_card_rows(rng, corpus_size, n_rows, needed):
+    if corpus_size <= 8 * needed:
+        base = np.tile(np.arange(corpus_size, dtype=np.uint32), (n_rows, 1))
+        return rng.permuted(base, axis=1)[:, :needed].copy()
+    rows = rng.integers(0, corpus_size, size=(n_rows, needed), dtype=np.uint32)
+    while True:
+        rows.sort(axis=1)
+        duplicates = np.zeros(rows.shape, dtype=bool)
+        duplicates[:, 1:] = rows[:, 1:] == rows[:, :-1]
+        count = int(duplicates.sum())
+        if count == 0:
+            return rng.permuted(rows, axis=1)
+        rows[duplicates] = rng.integers(0, corpus_size, size=count, dtype=np.uint32)
+
+# Paarweise Überschneidungen aller Karten über eine Zugehörigkeitsmatrix berechnen
+def _numpy_card_overlaps(matrix):
+    unique, inverse = np.unique(matrix, return_inverse=True)
+    member = np.zeros((matrix.shape[0], unique.size), dtype=np.float32)
+    member[np.repeat(np.arange(matrix.shape[0]), matrix.shape[1]), inverse.ravel()] = 1
+    overlaps = member @ member.T
+    np.fill_diagonal(overlaps, 0)
+    return overlaps
+
+def _numpy_card_matrix(corpus_size, n_cards, needed, seed, max_overlap):
+    rng = np.random.default_rng(seed)
+    matrix = _numpy_card_rows(rng, corpus_size, n_cards, needed)
+    if max_overlap is None:
+        return matrix
+    for _ in range(CARD_GENERATION_ATTEMPTS):
+        _, offending = np.nonzero(np.triu(_numpy_card_overlaps(matrix) > max_overlap, 1))
+        if offending.size == 0:
+            return matrix
+        offending = np.unique(offending)
+        matrix[offending] = _numpy_card_rows(rng, corpus_size, offending.size, needed)
+    raise ValueError(f"Keine Karten mit höchstens {max_overlap} gemeinsamen Wörtern gefunden.")
+
+# Fallback ohne NumPy: Karten einzeln mit einem geseedeten random.Random ziehen
+def _python_card_matrix(corpus_size, n_cards, needed, seed, max_overlap):
+    rng = random.Random(seed)
+    matrix = [rng.sample(range(corpus_size), needed) for _ in range(n_cards)]
+    if max_overlap is None:
+        return matrix
+    for _ in range(CARD_GENERATION_ATTEMPTS):
+        sets = [set(row) for row in matrix]
+        offending = sorted({j for i in range(n_cards) for j in range(i + 1, n_cards) if len(sets[i] & sets[j]) > max_overlap})
+        if not offending:
+            return matrix
+        for j in offending:
+            matrix[j] = rng.sample(range(corpus_size), needed)
+    raise ValueError(f"Keine Karten mit höchstens {max_overlap} gemeinsamen Wörtern gefunden.")
+
+# Indexmatrix (eine Zeile Korpus-Indizes pro Karte) für alle Karten einer Runde erzeugen
+def generate_card_matrix(corpus_size, n_cards, needed, seed, max_overlap=None, generator=None):
+    if needed > corpus_size:
+        raise ValueError("Nicht genügend Wörter in der Wortdatei.")
+    generator = generator or ("numpy" if np is not None else "python")
+    if generator == "numpy":
+        if np is None:
+            raise ValueError("Diese Runde wurde mit NumPy erzeugt, NumPy ist nicht installiert.")
+        return generator, [array('I', row.astype(np.uint32).tobytes()) for row in _numpy_card_matrix(corpus_size, n_cards, needed, seed, max_overlap)]
+    return generator, [array('I', row) for row in _python_card_matrix(corpus_size, n_cards, needed, seed, max_overlap)]
+
+# Datei mit den Kartenindizes einer Runde (feste Zeilenlänge, daher O(1)-Zugriff pro Spieler)
+def round_cards_path(roundfile):
+    return f"{roundfile}.cards"
+
+# Alle Karten einer Runde aus dem Seed der Rundendatei erzeugen und speichern
+def create_round_cards(roundfile):
+    try:
+        state = RoundState.load(roundfile)
+        corpus = WordCorpus.open(state.wordfile)
+        needed = words_needed(state.height, state.width)
+        max_overlap = int(state.settings["MaxOverlap"]) if "MaxOverlap" in state.settings else None
+        generator, matrix = generate_card_matrix(len(corpus), state.max_players, needed, int(state.settings["Seed"]), max_overlap)
+        with open(round_cards_path(roundfile), 'wb') as f:
+            for row in matrix:
+                if sys.byteorder == 'big':
+                    row.byteswap()
+                row.tofile(f)
+        append_to_roundfile(roundfile, [f"Generator: {generator}", f"WordHash: {corpus.file_hash}"])
+        return True
+    except Exception as e:
+        logging.error(f"Fehler beim Erzeugen der Bingokarten: {e}")
+        print(f"Die Bingokarten konnten nicht erzeugt werden: {e}")
+        return False
+
+# Rundendatei und Kartendatei einer nicht zustande gekommenen Runde entfernen
+def remove_round_files(roundfile):
+    for path in (roundfile, round_cards_path(roundfile)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Fehler beim Entfernen von {path}: {e}")
+
+# Kartenindizes eines Spielers anhand seiner Position in der Runde lesen
+def read_round_card_indices(roundfile, index, needed):
+    with open(round_cards_path(roundfile), 'rb') as f:
+        f.seek(index * needed * 4)
+        row = array('I')
+        row.fromfile(f, needed)
+    if sys.byteorder == 'big':
+        row.byteswap()
+    return row
+
+# Karte aus Korpus-Indizes aufbauen, das Mittelfeld wird bei ungeraden Maßen zum Joker
+def card_from_indices(height, width, corpus, indices):
+    words = iter(indices)
+    has_joker = height % 2 != 0 and width % 2 != 0
+    return [["JOKER" if has_joker and (i, j) == (height // 2, width // 2) else corpus.word(next(words)) for j in range(width)] for i in range(height)]
+
+# Karten einer Runde aus dem Seed neu erzeugen und mit der gespeicherten Datei vergleichen (für Streitfälle)
+def verify_round_cards(roundfile):
+    state = RoundState.load(roundfile)
+    corpus = WordCorpus.open(state.wordfile)
+    if state.settings.get("WordHash") != corpus.file_hash:
+        return False
+    needed = words_needed(state.height, state.width)
+    max_overlap = int(state.settings["MaxOverlap"]) if "MaxOverlap" in state.settings else None
+    _, matrix = generate_card_matrix(len(corpus), state.max_players, needed, int(state.settings["Seed"]), max_overlap, state.settings.get("Generator"))
+    return all(read_round_card_indices(roundfile, index, needed) == row for index, row in enumerate(matrix))
+
+# Allgemeine Ergebnisse beim Anhängen an die Rundendatei (Beenden, Aufrufen, Sieg eintragen)
+APPEND_OK = "ok"
+ROUND_FINISHED = "finished"
+
+# Ergebnisse beim Beitritt zu einer Runde; gleiche Werte wie oben, damit check_join als validate taugt
+JOIN_OK = APPEND_OK
+JOIN_NOT_FOUND = "not_found"
+JOIN_FINISHED = ROUND_FINISHED
+JOIN_FULL = "full"
+JOIN_NAME_TAKEN = "name_taken"
+
+JOIN_ERRORS = {
+    JOIN_NOT_FOUND: "Spiel nicht gefunden.",
+    JOIN_FINISHED: "Spiel ist bereits beendet.",
+    JOIN_FULL: "Maximale Anzahl an Spielern erreicht.",
+    JOIN_NAME_TAKEN: "Spielername bereits vergeben.",
+}
+
+# Rundendatei mit fcntl-Sperre öffnen (exklusiv zum Schreiben, geteilt zum Lesen)
+@contextmanager
+def locked_roundfile(roundfile, exclusive=True):
+    with open(roundfile, 'r+' if exclusive else 'r') as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+# Geparster Zustand einer Rundendatei, wird bis zur nächsten Änderung der Datei wiederverwendet
+class RoundState:
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, roundfile):
+        self.roundfile = roundfile
+        self.max_players = None
+        self.height = None
+        self.width = None
+        self.wordfile = None
+        self.round_id = None
+        self.players = []
+        self.finished = False
+        self.aborted = False
+        self.winner = None
+        # Vom Ausrufer bisher aufgerufene Wörter in Aufrufreihenfolge
+        self.called = []
+        # Weitere "Schlüssel: Wert"-Zeilen der Rundendatei
+        self.settings = {}
+
+    @classmethod
+    def parse(cls, roundfile, text):
+        state = cls(roundfile)
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith("player:"):
+                state.players.append(line.split(":", 1)[1].strip())
+            elif line.startswith("called:"):
+                state.called.append(line.split(":", 1)[1].strip())
+            elif line.startswith("winner:"):
+                state.winner = line.split(":", 1)[1].strip()
+            elif line == "finished":
+                state.finished = True
+            elif line == "Game aborted":
+                state.aborted = True
+            elif ":" in line:
+                key, value = line.split(":", 1)
+                state.settings[key.strip()] = value.strip()
+        state.max_players = int(state.settings["Max"]) if "Max" in state.settings else None
+        state.height = int(state.settings["Height"]) if "Height" in state.settings else None
+        state.width = int(state.settings["Width"]) if "Width" in state.settings else None
+        state.wordfile = state.settings.get("Wordfile")
+        state.round_id = int(state.settings["RoundId"]) if "RoundId" in state.settings else None
+        return state
+
+    # Rundendatei laden, solange sich Änderungszeit und Größe nicht ändern wird der Cache genutzt
+    @classmethod
+    def load(cls, roundfile):
+        path = os.path.abspath(roundfile)
+        st = os.stat(path)
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with cls._cache_lock:
+            cached = cls._cache.get(path)
+        if cached is not None and cached[0] == key:
+            if METRICS is not None:
+                METRICS.inc("bingo_roundfile_cache_hits_total")
+            return cached[1]
+        if METRICS is not None:
+            METRICS.inc("bingo_roundfile_reads_total")
+        with locked_roundfile(path, exclusive=False) as f:
+            st = os.fstat(f.fileno())
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            state = cls.parse(roundfile, f.read())
+        with cls._cache_lock:
+            cls._cache[path] = (key, state)
+        return state
+
+    def is_full(self):
+        return self.max_players is not None and len(self.players) >= self.max_players
+
+    # Beitritt prüfen, gibt JOIN_OK oder einen Fehlercode zurück
+    def check_join(self, player_name):
+        if self.finished:
+            return JOIN_FINISHED
+        if self.is_full():
+            return JOIN_FULL
+        if player_name in self.players:
+            return JOIN_NAME_TAKEN
+        return JOIN_OK
+
+# Zeilen unter Sperre an die Rundendatei anhängen, wenn validate(state) APPEND_OK zurückgibt
+def append_to_roundfile(roundfile, lines, validate=None):
+    with locked_roundfile(roundfile) as f:
+        state = RoundState.parse(roundfile, f.read())
+        result = validate(state) if validate else APPEND_OK
+        if result == APPEND_OK:
+            f.seek(0, os.SEEK_END)
+            f.write("".join(line + "\n" for line in lines))
+            f.flush()
+        return result
+
+# Spieler atomar in die Runde eintragen (Prüfung und Schreiben unter einer Sperre)
+def join_round(roundfile, player_name):
+    if not os.path.exists(roundfile):
+        return JOIN_NOT_FOUND
+    return append_to_roundfile(roundfile, ["player:" + player_name], lambda state: state.check_join(player_name))
+
+# Runde atomar als beendet markieren, gibt False zurück wenn sie bereits beendet war
+def finish_round(roundfile, aborted=False):
+    lines = ["finished", "Game aborted"] if aborted else ["finished"]
+    result = append_to_roundfile(roundfile, lines, lambda state: ROUND_FINISHED if state.finished else APPEND_OK)
+    return result == APPEND_OK
+
+# Sieg wurde nicht durch die aufgerufenen Wörter gedeckt
+CLAIM_REJECTED = "claim_rejected"
+
+# Invertierter Index einer Karte: Wort -> Liste der (Zeile, Spalte)-Positionen
+def build_word_index(cards):
+    index = {}
+    for row, line in enumerate(cards):
+        for col, word in enumerate(line):
+            index.setdefault(word, []).append((row, col))
+    return index
+
+# Prüfen, ob die Karte eines Spielers allein mit den aufgerufenen Wörtern gewonnen hat.
+# Liest nur die Kartendatei, damit die Prüfung auch unter der Sperre der Rundendatei laufen kann.
+def verify_claim(roundfile, player_name, state=None):
+    try:
+        state = state or RoundState.load(roundfile)
+        if player_name not in state.players or not os.path.exists(round_cards_path(roundfile)):
+            return False
+        corpus = WordCorpus.open(state.wordfile)
+        if state.settings.get("WordHash") != corpus.file_hash:
+            logging.error("Die Wortdatei wurde seit dem Erstellen der Runde verändert.")
+            return False
+        indices = read_round_card_indices(roundfile, state.players.index(player_name), words_needed(state.height, state.width))
+        cards = card_from_indices(state.height, state.width, corpus, indices)
+        word_index = build_word_index(cards)
+        card_state = CardState.from_card(cards, WinPatterns.for_round(state))
+        for word in set(state.called):
+            for row, col in word_index.get(word, ()):
+                card_state.mark(row, col)
+        return card_state.has_won()
+    except Exception as e:
+        logging.error(f"Fehler beim Prüfen des Sieges: {e}")
+        return False
+
+# Sieg atomar eintragen; in Runden mit Ausrufer nur, wenn die Aufrufliste den Sieg bestätigt.
+# Gibt APPEND_OK, ROUND_FINISHED oder CLAIM_REJECTED zurück.
+def claim_round(roundfile, player_name):
+    def validate(state):
+        if state.finished:
+            return ROUND_FINISHED
+        if "Caller" in state.settings and not verify_claim(roundfile, player_name, state):
+            return CLAIM_REJECTED
+        return APPEND_OK
+    return append_to_roundfile(roundfile, ["finished", "winner:" + player_name], validate)
+
+# Aufgerufenes Wort an die Rundendatei anhängen, gibt False zurück wenn die Runde beendet ist
+def record_call(roundfile, word):
+    result = append_to_roundfile(roundfile, ["called:" + word], lambda state: ROUND_FINISHED if state.finished else APPEND_OK)
+    return result == APPEND_OK
+
+# Lesen der Bingokarten aus der Rundendatei, mit Spielername die vorab erzeugte Karte des Spielers
+def read_bingo_cards(roundfile, player_name=None):
+    try:
+        state = RoundState.load(roundfile)
+        height, width = state.height, state.width
+        if height is None or width is None:
+            print("Höhe oder Breite in der Rundendatei nicht gefunden.")
+            return None
+        wordfile = state.wordfile
+        if wordfile is None:
+            print("Wortdatei in der Rundendatei nicht gefunden.")
+            return None
+        corpus = WordCorpus.open(wordfile)
+        if player_name in state.players and os.path.exists(round_cards_path(roundfile)):
+            if state.settings.get("WordHash") != corpus.file_hash:
+                print("Die Wortdatei wurde seit dem Erstellen der Runde verändert.")
+                return None
+            indices = read_round_card_indices(roundfile, state.players.index(player_name), words_needed(height, width))
+            return card_from_indices(height, width, corpus, indices)
+        cards = create_bingo_card(height, width, corpus)
+        return cards
+    except Exception as e:
+        logging.error(f"Fehler beim Lesen der Bingokarten: {e}")
+        return None
+
+# Lesen der Spieler aus der Rundendatei
+def read_players_from_roundfile(roundfile):
+    try:
+        return list(RoundState.load(roundfile).players)
+    except Exception as e:
+        logging.error(f"Fehler beim Lesen der Spieler aus der Rundendatei: {e}")
+        return []
+
+# Grenzen der Spaltenbreite; bei schmalen Terminals werden Wörter gekürzt statt umgebrochen
+MIN_COL_WIDTH = 6
+MAX_COL_WIDTH = 15
+# Zeilen unterhalb des Spielfelds: Leerzeile und Fortschrittsanzeige
+STATUS_LINES = 2
+
+# Renderer mit Frame-Puffer pro Bildschirmzelle; zeichnet nur geänderte, sichtbare Zellen neu.
+# Karten, die größer als das Terminal sind, werden in einem Ausschnitt gezeigt, der dem Cursor folgt.
+class CardRenderer:
+    def __init__(self, stdscr, cards, col_width=None, header_gap=3, doupdate=None):
+        self.stdscr = stdscr
+        self.doupdate = doupdate or curses.doupdate
+        self.cards = cards
+        self.height = len(cards)
+        self.width = len(cards[0])
+        # Feste Spaltenbreite, None passt sie an die Terminalbreite an
+        self.fixed_col_width = col_width
+        self.col_width = col_width or MAX_COL_WIDTH
+        self.header_gap = header_gap
+        self.header = []
+        self.status = ""
+        self.layout_dirty = True
+        self.status_dirty = True
+        self.status_drawn = 0
+        # Sichtbarer Ausschnitt: linke obere Kartenzelle und Anzahl sichtbarer Zeilen/Spalten
+        self.screen_size = None
+        self.top_row = 0
+        self.left_col = 0
+        self.view_rows = 0
+        self.view_cols = 0
+        self.focus = (0, 0)
+        # Zuletzt gezeichneter Inhalt (Text, Attribut) pro Bildschirmposition des Ausschnitts
+        self.frame = {}
+        self.dirty = set()
+        # Frame-Zähler zur Kontrolle der geschriebenen Bytes pro Tastendruck
+        self.frames = 0
+        self.total_bytes = 0
+        self.total_frame_time = 0.0
+        self.last_frame_bytes = 0
+        self.last_frame_cells = 0
+        self.last_frame_time = 0.0
+
+    @property
+    def board_top(self):
+        return len(self.header) + self.header_gap
+
+    @property
+    def status_y(self):
+        return self.board_top + max(self.view_rows, 1) * 2
+
+    # Kopfzeilen setzen, jede Zeile ist eine Liste aus (Text, Attribut)-Paaren
+    def set_header(self, header):
+        if header != self.header:
+            self.header = header
+            self.layout_dirty = True
+
+    # Text der Fortschrittsanzeige unter dem Spielfeld setzen
+    def set_status(self, status):
+        if status != self.status:
+            self.status = status
+            self.status_dirty = True
+
+    # Zelle, die sichtbar bleiben soll (normalerweise der Cursor)
+    def follow(self, row, col):
+        self.focus = (row, col)
+
+    def is_visible(self, row, col):
+        return (self.top_row <= row < self.top_row + self.view_rows
+                and self.left_col <= col < self.left_col + self.view_cols)
+
+    def invalidate(self, row, col):
+        if self.is_visible(row, col):
+            self.dirty.add((row, col))
+
+    def invalidate_all(self):
+        self.dirty = {
+            (row, col)
+            for row in range(self.top_row, self.top_row + self.view_rows)
+            for col in range(self.left_col, self.left_col + self.view_cols)
+        }
+
+    def cell_text(self, row, col):
+        word_to_display = self.cards[row][col][:self.col_width]
+        padding = " " * (self.col_width - len(word_to_display))
+        return f"| {word_to_display}{padding} "
+
+    def _addstr(self, y, x, text, attr=0):
+        self.stdscr.addstr(y, x, text, attr)
+        self.last_frame_bytes += len(text.encode())
+
+    # Spaltenbreite und Größe des Ausschnitts aus der Terminalgröße berechnen
+    def _layout(self):
+        rows, cols = self.screen_size
+        if self.fixed_col_width:
+            self.col_width = self.fixed_col_width
+        else:
+            self.col_width = max(MIN_COL_WIDTH, min(MAX_COL_WIDTH, (cols - 1) // self.width - 3))
+        self.view_cols = max(0, min(self.width, (cols - 1) // (self.col_width + 3)))
+        self.view_rows = max(0, min(self.height, (rows - self.board_top - STATUS_LINES + 1) // 2))
+
+    # Ausschnitt so wenig wie möglich verschieben, damit die Fokus-Zelle sichtbar ist
+    def _scroll(self):
+        row, col = self.focus
+        top = min(max(self.top_row, row - self.view_rows + 1), row, self.height - self.view_rows)
+        left = min(max(self.left_col, col - self.view_cols + 1), col, self.width - self.view_cols)
+        top, left = max(top, 0), max(left, 0)
+        if (top, left) != (self.top_row, self.left_col):
+            self.top_row, self.left_col = top, left
+            self.invalidate_all()
+
+    # Kopfzeilen und statische Gitterlinien des Ausschnitts komplett neu zeichnen
+    def _draw_static(self):
+        self._layout()
+        self.stdscr.erase()
+        max_x = self.screen_size[1] - 1
+        for y, line in enumerate(self.header[:self.screen_size[0] - 1]):
+            x = 0
+            for text, attr in line:
+                if x >= max_x:
+                    break
+                self._addstr(y, x, text[:max_x - x], attr)
+                x += len(text)
+        if self.view_rows and self.view_cols:
+            separator = "+" + ("-" * (self.col_width + 2) + "+") * self.view_cols
+            right_edge = self.view_cols * (self.col_width + 3)
+            for row in range(self.view_rows):
+                y = self.board_top + row * 2
+                self._addstr(y, right_edge, "|")
+                if row < self.view_rows - 1:
+                    self._addstr(y + 1, 0, separator)
+        elif self.board_top < self.screen_size[0]:
+            self._addstr(self.board_top, 0, "Terminal zu klein"[:max_x])
+        self.layout_dirty = False
+        self.status_dirty = True
+        self.status_drawn = 0
+        self.frame = {}
+        self.invalidate_all()
+
+    def _draw_status(self):
+        y = self.status_y
+        max_x = self.screen_size[1] - 1
+        if y < self.screen_size[0] and max_x > 0:
+            # Mit Leerzeichen bis zur Länge des vorherigen Textes überschreiben
+            text = self.status[:max_x]
+            if text or self.status_drawn:
+                self._addstr(y, 0, text.ljust(min(max(self.status_drawn, len(text)), max_x)))
+            self.status_drawn = len(text)
+        self.status_dirty = False
+
+    # Geänderte Zellen zeichnen, cell_attr liefert das Attribut pro (Zeile, Spalte);
+    # status wird nach dem Verschieben des Ausschnitts aufgerufen und liefert die Fortschrittsanzeige
+    def render(self, cell_attr, status=None):
+        start = time.perf_counter()
+        self.last_frame_bytes = 0
+        self.last_frame_cells = 0
+        screen_size = self.stdscr.getmaxyx()
+        if screen_size != self.screen_size:
+            self.screen_size = screen_size
+            self.layout_dirty = True
+        if self.layout_dirty:
+            self._draw_static()
+        self._scroll()
+        if status is not None:
+            self.set_status(status())
+        for row, col in self.dirty:
+            if not self.is_visible(row, col):
+                continue
+            content = (self.cell_text(row, col), cell_attr(row, col))
+            slot = (row - self.top_row, col - self.left_col)
+            if self.frame.get(slot) == content:
+                continue
+            self._addstr(self.board_top + slot[0] * 2, slot[1] * (self.col_width + 3), *content)
+            self.frame[slot] = content
+            self.last_frame_cells += 1
+        self.dirty.clear()
+        if self.status_dirty:
+            self._draw_status()
+        self.stdscr.noutrefresh()
+        self.doupdate()
+        self.last_frame_time = time.perf_counter() - start
+        self.frames += 1
+        self.total_bytes += self.last_frame_bytes
+        self.total_frame_time += self.last_frame_time
+        if METRICS is not None:
+            METRICS.observe("bingo_frame_seconds", self.last_frame_time)
+
+    # Beschreibung des sichtbaren Ausschnitts, z. B. "Zeilen 1-10/40, Spalten 1-5/40"
+    def viewport_summary(self):
+        if self.view_rows == self.height and self.view_cols == self.width:
+            return ""
+        return (f"Zeilen {self.top_row + 1}-{self.top_row + self.view_rows}/{self.height}, "
+                f"Spalten {self.left_col + 1}-{self.left_col + self.view_cols}/{self.width}")
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "total_bytes": self.total_bytes,
+            "last_frame_bytes": self.last_frame_bytes,
+            "last_frame_cells": self.last_frame_cells,
+            "avg_frame_time_ms": (self.total_frame_time / self.frames * 1000) if self.frames else 0.0,
+            "viewport": (self.top_row, self.left_col, self.view_rows, self.view_cols),
+        }
+
+# Anzeigen der Bingokarten
+def display_bingo_cards(cards, player_name, game_won_event, game_aborted_event, all_player_queues, roundfile, mq=None, log_file=None):
+    log_file = log_file or create_log_file(player_name)
+    log_message(log_file, "Start des Spiels")
+    log_message(log_file, f"Größe des Spielfelds: {len(cards[0])}x{len(cards)}")
+    
+    players = read_players_from_roundfile(roundfile)
+    sender_id = sender_id_for(players, player_name)
+    round_id = round_id_for(roundfile)
+    if METRICS is not None:
+        for queue in [mq, *all_player_queues]:
+            METRICS.watch_queue(queue)
+    
+    try:
+        stdscr = curses.initscr()
+        curses.noecho()
+        curses.cbreak()
+        stdscr.keypad(True)
+
+        curses.start_color()
+        curses.init_pair(1, curses.COLOR_MAGENTA, curses.COLOR_BLACK)
+        curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)
+        curses.init_pair(3, curses.COLOR_BLACK, curses.COLOR_WHITE)
+        curses.init_pair(4, curses.COLOR_GREEN, curses.COLOR_BLACK)
+        curses.init_pair(5, curses.COLOR_YELLOW, curses.COLOR_BLACK)
+
+        cursor_idx = (0, 0)
+        round_state = RoundState.load(roundfile)
+        card_state = CardState.from_card(cards, WinPatterns.for_round(round_state))
+        renderer = CardRenderer(stdscr, cards)
+        notice = ""
+        won = False
+
+        # Eigenen Fortschritt auf der Anzeigetafel der Runde veröffentlichen, nur wenn er sich geändert hat
+        scoreboard = Scoreboard.attach(roundfile)
+        slot = round_state.players.index(player_name) if player_name in round_state.players else -1
+        published = None
+
+        def publish(status, force=False):
+            nonlocal published
+            if scoreboard is not None and (force or (card_state.mask, status) != published):
+                scoreboard.publish(slot, player_name, status, card_state.mask)
+                published = (card_state.mask, status)
+
+        # Runden mit Ausrufer: aufgerufene Wörter werden über den Wortindex der Karte automatisch markiert
+        caller_mode = "Caller" in round_state.settings
+        word_index = build_word_index(cards) if caller_mode else {}
+
+        # Lebenszeichen senden und schweigende Mitspieler erkennen (Einstellungen aus der Rundendatei)
+        heartbeat_interval = float(round_state.settings.get("Heartbeat", DEFAULT_HEARTBEAT_INTERVAL))
+        heartbeat_misses = int(round_state.settings.get("HeartbeatMisses", DEFAULT_HEARTBEAT_MISSES))
+        on_player_gone = round_state.settings.get("OnPlayerGone", PLAYER_GONE_CONTINUE)
+        detector = FailureDetector([player for player in players if player != player_name], heartbeat_interval, heartbeat_misses)
+        next_heartbeat = time.monotonic()
+
+        def build_header():
+            return [
+                [("Spieler im Spiel:", curses.A_BOLD)] + [(f"{player} (weg)," if player in detector.gone else f"{player},", curses.A_NORMAL) for player in players],
+                [("Rundenname:", curses.A_BOLD), (f"{roundfile}", curses.A_NORMAL)],
+                [],
+                [("Um das Spiel zu verlassen drücke die `Esc`-Taste auf deinem Keyboard", curses.A_BOLD)],
+            ]
+        renderer.set_header(build_header())
+
+        # Fortschrittsanzeige unter dem Spielfeld, bei großen Karten mit sichtbarem Ausschnitt
+        def build_status():
+            missing, pattern = card_state.closest_pattern()
+            status = (f"Markiert: {card_state.marked_count()}/{card_state.height * card_state.width}, "
+                      f"bis zum Sieg fehlen: {missing} ({PATTERN_LABELS.get(pattern, pattern)})")
+            viewport = renderer.viewport_summary()
+            return " | ".join(part for part in (status, viewport, notice) if part)
+
+        cursor_attr = curses.color_pair(1)
+
+        def cell_attr(row, col):
+            if (row, col) == cursor_idx:
+                return cursor_attr
+            if (row, col) in card_state:
+                return curses.color_pair(2) | curses.A_BOLD
+            return curses.A_NORMAL
+
+        # Sieg in der Rundendatei eintragen und melden, gibt True zurück wenn das Spiel beendet ist
+        def claim_win():
+            nonlocal notice, won
+            if game_won_event.is_set():
+                return True
+            result = claim_round(roundfile, player_name)
+            if result == CLAIM_REJECTED:
+                notice = "Sieg abgelehnt: nicht alle markierten Wörter wurden aufgerufen"
+                logging.debug("Sieg wurde von der Aufrufliste nicht bestätigt.")
+                return False
+            if result == APPEND_OK:
+                won = True
+                broadcast_message(all_player_queues, make_message(MSG_WON, sender_id, round_id))
+                log_message(log_file, "Sieg")
+                flush_log(log_file)
+                logging.debug("Spiel gewonnen, Abbruch der Anzeige.")
+            else:
+                logging.debug("Runde wurde bereits von einem anderen Spieler beendet.")
+            game_won_event.set()
+            return True
+
+        # Aufgerufenes Wort auf der eigenen Karte markieren, gibt True zurück wenn das Spiel beendet ist
+        def apply_call(word):
+            marked = False
+            for row, col in word_index.get(word, ()):
+                if card_state.mark(row, col):
+                    renderer.invalidate(row, col)
+                    log_message(log_file, f"{word} ({row}/{col})")
+                    marked = True
+            return marked and card_state.has_won() and claim_win()
+
+        # Runde abbrechen und alle Mitspieler benachrichtigen
+        def abort_round():
+            log_message(log_file, "Abbruch")
+            flush_log(log_file)
+            broadcast_message(all_player_queues, make_message(MSG_ABORTED, sender_id, round_id))
+            game_aborted_event.set()
+            finish_round(roundfile, aborted=True)
+
+        # Ein Mitspieler sendet keine Lebenszeichen mehr: nicht mehr anschreiben, je nach Einstellung abbrechen
+        def handle_player_gone(name):
+            nonlocal notice
+            notice = f"{name} antwortet nicht mehr"
+            log_message(log_file, f"Spieler {name} antwortet nicht mehr")
+            all_player_queues[:] = [queue for queue in all_player_queues if queue is None or queue.name != f"/mq_{name}"]
+            renderer.set_header(build_header())
+            if on_player_gone == PLAYER_GONE_ABORT:
+                abort_round()
+
+        # Eine Nachricht der eigenen Warteschlange verarbeiten
+        def process_message(message):
+            if handle_message(message, context):
+                renderer.set_header(build_header())
+
+        context = MessageContext(game_won_event, game_aborted_event, all_player_queues, players, log_file, round_id,
+                                 roundfile=roundfile, caller_mode=caller_mode, on_call=apply_call,
+                                 player_name=player_name, detector=detector)
+
+        # Bereits vor dem Start aufgerufene Wörter nachholen
+        for word in round_state.called:
+            apply_call(word)
+
+        # Einen Tastendruck verarbeiten, gibt True zurück wenn das Spiel beendet ist
+        def handle_key(key):
+            nonlocal cursor_idx
+            previous_idx = cursor_idx
+            if key == curses.KEY_UP:
+                cursor_idx = (max(cursor_idx[0] - 1, 0), cursor_idx[1])
+            elif key == curses.KEY_DOWN:
+                cursor_idx = (min(cursor_idx[0] + 1, len(cards) - 1), cursor_idx[1])
+            elif key == curses.KEY_RIGHT:
+                cursor_idx = (cursor_idx[0], min(cursor_idx[1] + 1, len(cards[0]) - 1))
+            elif key == curses.KEY_LEFT:
+                cursor_idx = (cursor_idx[0], max(cursor_idx[1] - 1, 0))
+            elif key == 10:  # Enter-Taste zum Auswählen
+                renderer.invalidate(*cursor_idx)
+                if card_state.toggle(*cursor_idx):
+                    log_message(log_file, f"{cards[cursor_idx[0]][cursor_idx[1]]} ({cursor_idx[0]}/{cursor_idx[1]})")
+                if check_win(cards, card_state) and claim_win():
+                    return True
+            elif key == 27:  # Esc-Taste
+                abort_round()
+                return True
+            if cursor_idx != previous_idx:
+                renderer.invalidate(*previous_idx)
+                renderer.invalidate(*cursor_idx)
+            return False
+
+        # Tastatur und eigene Nachrichtenwarteschlange gemeinsam über select abwarten
+        stdscr.nodelay(True)
+        stdin_fd = sys.stdin.fileno()
+        watched = [stdin_fd] if mq is None else [stdin_fd, mq.mqd]
+
+        while not game_won_event.is_set() and not game_aborted_event.is_set():
+            # Lebenszeichen gehen ohne Wiederholung raus; ein verlorenes fällt erst nach mehreren Intervallen auf
+            now = time.monotonic()
+            heartbeat_due = now >= next_heartbeat
+            if heartbeat_due:
+                broadcast_message([queue for queue in all_player_queues if queue is not mq], make_message(MSG_HEARTBEAT, sender_id, round_id), retries=0)
+                next_heartbeat = now + heartbeat_interval
+            for name in detector.check():
+                handle_player_gone(name)
+            if game_aborted_event.is_set():
+                break
+            publish(SLOT_PLAYING, force=heartbeat_due)
+            renderer.follow(*cursor_idx)
+            renderer.render(cell_attr, build_status)
+            readable, _, _ = select.select(watched, [], [], max(0, min(EVENT_LOOP_TIMEOUT, next_heartbeat - time.monotonic())))
+            if mq is not None and mq.mqd in readable:
+                if METRICS is not None:
+                    METRICS.inc("bingo_listener_iterations_total")
+                message = receive_message(mq, timeout=0)
+                while message is not None:
+                    process_message(message)
+                    message = receive_message(mq, timeout=0)
+            # Nach einem Timeout ebenfalls lesen, damit eine Größenänderung (KEY_RESIZE) ankommt
+            if stdin_fd in readable or not readable:
+                key = stdscr.getch()
+                while key != -1:
+                    if handle_key(key):
+                        break
+                    key = stdscr.getch()
+
+        publish(SLOT_WON if won else SLOT_ABORTED if game_aborted_event.is_set() else SLOT_DONE)
+        if scoreboard is not None:
+            scoreboard.close()
+
+        # Nach dem Spielende blinkt nur noch die Cursor-Zelle, der Rest bleibt stehen
+        flicker = False
+        flicker_start_time = time.time()
+        while time.time() - flicker_start_time < 3 and not game_aborted_event.is_set():
+            cursor_attr = curses.color_pair(4 if flicker else 5)
+            renderer.invalidate(*cursor_idx)
+            renderer.render(cell_attr)
+            time.sleep(0.5)
+            flicker = not flicker
+
+        logging.debug("Renderer: %s", renderer.stats())
+
+    except Exception as e:
+        logging.error(f"Fehler beim Anzeigen der Bingokarten: {e}")
+    finally:
+        curses.echo()
+        curses.nocbreak()
+        stdscr.keypad(False)
+        curses.endwin()
+        log_message(log_file, "Ende des Spiels")
+        close_log(log_file)
+
+# Aktualisierungsintervall der Zuschaueransicht in Sekunden
+DEFAULT_WATCH_INTERVAL = 0.25
+
+# Eine Zeile der Zuschaueransicht auf die Terminalbreite kürzen und ausgeben
+def _watch_line(stdscr, y, text, attr=0):
+    rows, cols = stdscr.getmaxyx()
+    if y < rows - 1:
+        stdscr.addstr(y, 0, text[:cols - 1], attr)
+
+# Zuschaueransicht: liest die Anzeigetafel der Runde nur lesend aus dem gemeinsamen Speicher,
+# ohne Nachrichten und ohne Kopie des Segments; neu gezeichnet wird nur, wenn sich etwas geändert hat
+def watch_round(roundfile, interval=DEFAULT_WATCH_INTERVAL):
+    board = Scoreboard.attach(roundfile, writable=False)
+    if board is None:
+        print("Für diese Runde gibt es keine Anzeigetafel.")
+        return False
+    round_state = RoundState.load(roundfile)
+    patterns = WinPatterns.for_round(round_state)
+    # Spieler, deren Slot länger als die Heartbeat-Frist nicht aufgefrischt wurde, antworten nicht mehr
+    silence_limit = float(round_state.settings.get("Heartbeat", DEFAULT_HEARTBEAT_INTERVAL)) * int(round_state.settings.get("HeartbeatMisses", DEFAULT_HEARTBEAT_MISSES))
+    total = board.height * board.width
+    stdscr = curses.initscr()
+    try:
+        curses.noecho()
+        curses.cbreak()
+        curses.curs_set(0)
+        stdscr.keypad(True)
+        stdscr.nodelay(True)
+        last = None
+        while True:
+            state = RoundState.load(roundfile)
+            # Einmal pro Sekunde neu zeichnen, damit Alter und fehlende Lebenszeichen aktuell bleiben
+            current = (board.sequences(), state.finished, stdscr.getmaxyx(), int(time.time()))
+            if current != last:
+                last = current
+                stdscr.erase()
+                _watch_line(stdscr, 0, f"Runde: {roundfile} ({'beendet' if state.finished else 'läuft'}), Karte {board.width}x{board.height}", curses.A_BOLD)
+                _watch_line(stdscr, 1, "Beenden mit `q` oder `Esc`")
+                _watch_line(stdscr, 3, f"{'Spieler':<20} {'Status':<12} {'Markiert':>9} {'Fehlend':>8}  Fortschritt", curses.A_BOLD)
+                y = 4
+                for slot in range(board.max_players):
+                    entry = board.read(slot)
+                    if entry is None:
+                        continue
+                    name, status, seq, updated, mask = entry
+                    marked = mask.bit_count()
+                    missing, pattern = CardState.from_mask(board.height, board.width, mask, patterns).closest_pattern()
+                    bar = "#" * (marked * 20 // total) if total else ""
+                    age = time.time() - updated
+                    label = "antwortet nicht" if status == SLOT_PLAYING and age > silence_limit else SLOT_LABELS.get(status, "?")
+                    _watch_line(stdscr, y, f"{name:<20} {label:<12} {marked:>4}/{total:<4} {missing:>8}  [{bar:<20}] {PATTERN_LABELS.get(pattern, pattern)}, vor {age:.0f}s",
+                                curses.A_BOLD if status == SLOT_WON else 0)
+                    y += 1
+                if y == 4:
+                    _watch_line(stdscr, y, "Noch keine Spieler im Spiel.")
+                stdscr.noutrefresh()
+                curses.doupdate()
+            key = stdscr.getch()
+            if key in (ord('q'), 27):
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        curses.echo()
+        curses.nocbreak()
+        stdscr.keypad(False)
+        curses.endwin()
+        board.close()
+    return True
+
+# Standard-Gewinnmuster: eine vollständige Zeile, Spalte oder Diagonale
+DEFAULT_PATTERNS = "lines"
+
+# Anzeigenamen der Gewinnmuster
+PATTERN_LABELS = {
+    "lines": "Linie",
+    "four_corners": "Vier Ecken",
+    "x": "X",
+    "full_house": "Volle Karte",
+    "blackout": "Volle Karte",
+}
+
+# Gewinnmuster einer Runde, einmal pro Kartengröße in Bitmasken übersetzt.
+# Linien werden nicht als Masken gespeichert, sondern über die Zähler in CardState geprüft
+# (bei großen Karten wären das 2 * n Masken mit je n * n Bits).
+# Spezifikation: kommagetrennt, z. B. "lines,four_corners,x,full_house,mask:101/010/101"
+class WinPatterns:
+    _cache = {}
+
+    def __init__(self, spec, height, width):
+        self.spec = spec
+        self.height = height
+        self.width = width
+        self.lines = False
+        # Liste aus (Name, Bitmaske)
+        self.masks = []
+        custom = 0
+        for token in (token.strip() for token in spec.split(",")):
+            if token == "lines":
+                self.lines = True
+            elif token == "four_corners":
+                self.masks.append((token, self._mask([(0, 0), (0, width - 1), (height - 1, 0), (height - 1, width - 1)])))
+            elif token == "x":
+                if height != width:
+                    raise ValueError("Das Muster 'x' gibt es nur auf quadratischen Karten.")
+                self.masks.append((token, self._mask([(i, i) for i in range(height)] + [(i, width - 1 - i) for i in range(height)])))
+            elif token in ("full_house", "blackout"):
+                self.masks.append((token, (1 << (height * width)) - 1))
+            elif token.startswith("mask:"):
+                rows = token[len("mask:"):].split("/")
+                if len(rows) != height or any(len(row) != width for row in rows):
+                    raise ValueError(f"Eigene Maske passt nicht zur Kartengröße {width}x{height}: {token}")
+                cells = [(r, c) for r, row in enumerate(rows) for c, char in enumerate(row) if char in "1xX#"]
+                if not cells:
+                    raise ValueError(f"Eigene Maske ohne markierte Zellen: {token}")
+                custom += 1
+                self.masks.append((f"mask{custom}", self._mask(cells)))
+            else:
+                raise ValueError(f"Unbekanntes Gewinnmuster: {token}")
+        if not self.lines and not self.masks:
+            raise ValueError("Keine Gewinnmuster angegeben.")
+
+    def _mask(self, cells):
+        mask = 0
+        for row, col in cells:
+            mask |= 1 << (row * self.width + col)
+        return mask
+
+    # Übersetzte Muster aus dem Cache holen, jede Spezifikation wird pro Kartengröße nur einmal übersetzt
+    @classmethod
+    def compile(cls, spec, height, width):
+        key = (spec, height, width)
+        patterns = cls._cache.get(key)
+        if patterns is None:
+            patterns = cls._cache[key] = cls(spec, height, width)
+        return patterns
+
+    @classmethod
+    def for_round(cls, state):
+        return cls.compile(state.settings.get("Patterns", DEFAULT_PATTERNS), state.height, state.width)
+
+    # Name des ersten vollständigen Musters oder None
+    def completed(self, state):
+        if self.lines and state.completed_lines > 0:
+            return "lines"
+        for name, mask in self.masks:
+            if state.mask & mask == mask:
+                return name
+        return None
+
+    # Kleinste Anzahl noch fehlender Zellen und das zugehörige Muster als (Anzahl, Name)
+    def closest(self, state):
+        best = (state.line_cells_to_win(), "lines") if self.lines else (self.height * self.width + 1, None)
+        for name, mask in self.masks:
+            missing = (mask & ~state.mask).bit_count()
+            if missing < best[0]:
+                best = (missing, name)
+        return best
+
+# Zustand einer Bingokarte als Bitmaske mit Treffer-Zählern pro Zeile, Spalte und Diagonale;
+# mit patterns entscheiden die Gewinnmuster der Runde statt der Linien über den Sieg
+class CardState:
+    def __init__(self, height, width, patterns=None):
+        self.height = height
+        self.patterns = patterns
+        self.width = width
+        self.mask = 0
+        self.row_hits = [0] * height
+        self.col_hits = [0] * width
+        # Diagonalen gibt es nur auf quadratischen Karten
+        self.has_diagonals = height == width
+        self.diag_hits = 0
+        self.anti_diag_hits = 0
+        self.completed_lines = 0
+
+    # Zustand aus einer bestehenden Karte (Joker vormarkiert) erzeugen
+    @classmethod
+    def from_card(cls, cards, patterns=None):
+        state = cls(len(cards), len(cards[0]), patterns)
+        for row in range(state.height):
+            for col in range(state.width):
+                if cards[row][col] == "JOKER":
+                    state.mark(row, col)
+        return state
+
+    # Zustand aus einer Menge markierter (Zeile, Spalte)-Paare erzeugen
+    @classmethod
+    def from_indices(cls, height, width, selected_indices, patterns=None):
+        state = cls(height, width, patterns)
+        for row, col in selected_indices:
+            state.mark(row, col)
+        return state
+
+    # Zustand aus einer Bitmaske erzeugen (z. B. aus der Anzeigetafel)
+    @classmethod
+    def from_mask(cls, height, width, mask, patterns=None):
+        state = cls(height, width, patterns)
+        while mask:
+            lowest = mask & -mask
+            index = lowest.bit_length() - 1
+            state.mark(index // width, index % width)
+            mask ^= lowest
+        return state
+
+    def bit(self, row, col):
+        return 1 << (row * self.width + col)
+
+    def is_marked(self, row, col):
+        return bool(self.mask & self.bit(row, col))
+
+    def __contains__(self, cell):
+        return self.is_marked(*cell)
+
+    # Zähler einer Linie anpassen und abgeschlossene Linien mitzählen
+    def _update_line(self, hits, length, delta):
+        if delta < 0 and hits == length:
+            self.completed_lines -= 1
+        hits += delta
+        if delta > 0 and hits == length:
+            self.completed_lines += 1
+        return hits
+
+    def _apply(self, row, col, delta):
+        self.row_hits[row] = self._update_line(self.row_hits[row], self.width, delta)
+        self.col_hits[col] = self._update_line(self.col_hits[col], self.height, delta)
+        if self.has_diagonals:
+            if row == col:
+                self.diag_hits = self._update_line(self.diag_hits, self.height, delta)
+            if row + col == self.width - 1:
+                self.anti_diag_hits = self._update_line(self.anti_diag_hits, self.height, delta)
+
+    # Zelle markieren, gibt zurück ob sich der Zustand geändert hat
+    def mark(self, row, col):
+        bit = self.bit(row, col)
+        if self.mask & bit:
+            return False
+        self.mask |= bit
+        self._apply(row, col, 1)
+        return True
+
+    # Markierung einer Zelle entfernen, gibt zurück ob sich der Zustand geändert hat
+    def unmark(self, row, col):
+        bit = self.bit(row, col)
+        if not self.mask & bit:
+            return False
+        self.mask &= ~bit
+        self._apply(row, col, -1)
+        return True
+
+    # Zelle umschalten, gibt den neuen Markierungszustand zurück
+    def toggle(self, row, col):
+        if self.unmark(row, col):
+            return False
+        self.mark(row, col)
+        return True
+
+    def has_won(self):
+        if self.patterns is None:
+            return self.completed_lines > 0
+        return self.patterns.completed(self) is not None
+
+    def marked_count(self):
+        return self.mask.bit_count()
+
+    # Wie viele Zellen der am weitesten fortgeschrittenen Linie noch fehlen
+    def line_cells_to_win(self):
+        missing = min(self.width - max(self.row_hits), self.height - max(self.col_hits))
+        if self.has_diagonals:
+            missing = min(missing, self.height - self.diag_hits, self.height - self.anti_diag_hits)
+        return missing
+
+    # Kleinste Anzahl noch fehlender Zellen und das zugehörige Muster als (Anzahl, Name)
+    def closest_pattern(self):
+        if self.patterns is None:
+            return self.line_cells_to_win(), "lines"
+        return self.patterns.closest(self)
+
+    def cells_to_win(self):
+        return self.closest_pattern()[0]
+
+# Zellen aller Linien (Zeilen, Spalten, bei quadratischen Karten Diagonalen) pro Kartengröße
+_LINE_CELLS = {}
+
+def _line_cells(height, width):
+    lines = _LINE_CELLS.get((height, width))
+    if lines is None:
+        lines = [tuple((row, col) for col in range(width)) for row in range(height)]
+        lines += [tuple((row, col) for row in range(height)) for col in range(width)]
+        if height == width:
+            lines.append(tuple((i, i) for i in range(height)))
+            lines.append(tuple((i, width - 1 - i) for i in range(height)))
+        lines = _LINE_CELLS[(height, width)] = lines
+    return lines
+
+# Linien einer Menge markierter (Zeile, Spalte)-Paare prüfen; bricht bei der ersten fehlenden Zelle
+# einer Linie und bei der ersten vollständigen Linie ab
+def _lines_complete(height, width, selected_indices):
+    if len(selected_indices) < min(height, width):
+        return False
+    contains = selected_indices.__contains__
+    return any(all(map(contains, line)) for line in _line_cells(height, width))
+
+# Überprüfen, ob ein Spieler gewonnen hat; mit einem CardState in O(1), mit einer Menge ohne
+# Aufbau eines Zustands
+def check_win(cards, selected_indices, patterns=None):
+    if isinstance(selected_indices, CardState):
+        return selected_indices.has_won()
+    height, width = len(cards), len(cards[0])
+    if (patterns is None or patterns.lines) and _lines_complete(height, width, selected_indices):
+        return True
+    if patterns is None or not patterns.masks:
+        return False
+    mask = 0
+    for row, col in selected_indices:
+        mask |= 1 << (row * width + col)
+    return any(mask & pattern == pattern for _, pattern in patterns.masks)
+
+# Überprüfen des Zugangs zur Runde
+def check_access(roundfile, player_name):
+    try:
+        if not os.path.exists(roundfile):
+            print(JOIN_ERRORS[JOIN_NOT_FOUND])
+            return False
+
+        result = RoundState.load(roundfile).check_join(player_name)
+        if result in (JOIN_FINISHED, JOIN_FULL):
+            print(JOIN_ERRORS[result])
+        return result == JOIN_OK
+    except Exception as e:
+        logging.error(f"Fehler bei der Überprüfung des Zugangs: {e}")
+        return False
+
+# Spieler erstellen, gibt JOIN_OK oder einen Fehlercode zurück
+def create_player(roundfile, player_name):
+    try:
+        result = join_round(roundfile, player_name)
+        if result == JOIN_OK:
+            print("Spieler erfolgreich erstellt.")
+        return result
+    except Exception as e:
+        logging.error(f"Fehler beim Erstellen des Spielers: {e}")
+        return JOIN_NOT_FOUND
+
+# Rundendatei erstellen
+def create_round_file(roundfile, height, width, wordfile, max_players, seed=None, max_overlap=None, min_players=DEFAULT_MIN_PLAYERS, caller=False, patterns=DEFAULT_PATTERNS,
+                      heartbeat_interval=DEFAULT_HEARTBEAT_INTERVAL, heartbeat_misses=DEFAULT_HEARTBEAT_MISSES, on_player_gone=PLAYER_GONE_CONTINUE):
+    try:
+        if seed is None:
+            seed = secrets.randbits(63)
+        with open(roundfile, 'w') as f:
+            # Zufällige ID, damit eine neu angelegte Rundendatei nicht die Warteschlangen der alten übernimmt
+            f.write(f"RoundId: {secrets.randbits(32)}\n")
+            f.write(f"Max: {max_players}\n")
+            f.write(f"Height: {height}\n")
+            f.write(f"Width: {width}\n")
+            f.write(f"Wordfile: {wordfile}\n")
+            f.write(f"Seed: {seed}\n")
+            f.write(f"MinPlayers: {min_players}\n")
+            f.write(f"Heartbeat: {heartbeat_interval}\n")
+            f.write(f"HeartbeatMisses: {heartbeat_misses}\n")
+            f.write(f"OnPlayerGone: {on_player_gone}\n")
+            if max_overlap is not None:
+                f.write(f"MaxOverlap: {max_overlap}\n")
+            if caller:
+                f.write("Caller: on\n")
+            if patterns != DEFAULT_PATTERNS:
+                f.write(f"Patterns: {patterns}\n")
+        print("Rundendatei erfolgreich erstellt.")
+        return True
+    except Exception as e:
+        logging.error(f"Fehler beim Erstellen der Rundendatei: {e}")
+        return False
+
+# Protokolldatei erstellen
+def create_log_file(player_name):
+    current_time = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+    log_folder = os.path.join(os.getcwd(), 'logfiles')
+    os.makedirs(log_folder, exist_ok=True)
+    log_filename = f"{current_time}-bingo-{player_name}.txt"
+    log_filepath = os.path.join(log_folder, log_filename)
+    return log_filepath
+
+# Protokolleinträge werden gesammelt und spätestens nach LOG_FLUSH_INTERVAL Sekunden
+# oder ab LOG_BATCH_SIZE Einträgen gemeinsam geschrieben
+LOG_FLUSH_INTERVAL = 1.0
+LOG_BATCH_SIZE = 64
+
+_LOG_STOP = object()
+
+# Spielprotokoll eines Spielers, geschrieben von einem Hintergrund-Thread
+class GameLogger:
+    def __init__(self, log_filepath, flush_interval=LOG_FLUSH_INTERVAL, batch_size=LOG_BATCH_SIZE):
+        self.log_filepath = log_filepath
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"GameLogger-{os.path.basename(log_filepath)}", daemon=True)
+        self._thread.start()
+
+    # Eintrag vormerken; Zeitstempel und Formatierung übernimmt der Hintergrund-Thread
+    def log(self, message):
+        self._queue.put((time.time(), message))
+
+    # Warten, bis alle bisherigen Einträge auf der Platte sind
+    def flush(self, timeout=5.0):
+        done = threading.Event()
+        self._queue.put((None, done))
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        self._queue.put(_LOG_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        buffer = []
+        last_write = time.monotonic()
+        last_second, last_stamp = None, ""
+        with open(self.log_filepath, 'a') as log_file:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+                waiter = None
+                if item is not None and item is not _LOG_STOP:
+                    timestamp, message = item
+                    if timestamp is None:
+                        waiter = message
+                    else:
+                        second = int(timestamp)
+                        if second != last_second:
+                            last_second = second
+                            last_stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+                        buffer.append(f"{last_stamp} {message}\n")
+                now = time.monotonic()
+                if buffer and (item is None or item is _LOG_STOP or waiter or len(buffer) >= self.batch_size or now - last_write >= self.flush_interval):
+                    log_file.write("".join(buffer))
+                    log_file.flush()
+                    buffer.clear()
+                    last_write = now
+                if waiter is not None:
+                    waiter.set()
+                if item is _LOG_STOP:
+                    return
+
+_game_loggers = {}
+_game_loggers_lock = threading.Lock()
+
+# Gemeinsamen GameLogger für eine Protokolldatei holen (einer pro Datei und Prozess)
+def get_game_logger(log_filepath):
+    with _game_loggers_lock:
+        logger = _game_loggers.get(log_filepath)
+        if logger is None:
+            logger = _game_loggers[log_filepath] = GameLogger(log_filepath)
+        return logger
+
+# Nachricht in die Protokolldatei schreiben
+def log_message(log_filepath, message):
+    get_game_logger(log_filepath).log(message)
+
+# Ausstehende Einträge sofort schreiben (bei Sieg oder Abbruch)
+def flush_log(log_filepath):
+    get_game_logger(log_filepath).flush()
+
+# Protokoll schließen und den Hintergrund-Thread beenden
+def close_log(log_filepath):
+    with _game_loggers_lock:
+        logger = _game_loggers.pop(log_filepath, None)
+    if logger is not None:
+        logger.close()
+
+@atexit.register
+def _close_all_logs():
+    for log_filepath in list(_game_loggers):
+        close_log(log_filepath)
+
+# Auswertung der Protokolldateien: jede abgeschlossene Partie wird einmal geparst und als Zeile
+# in einer kompakten, spaltenweise gespeicherten Zusammenfassung abgelegt
+LOG_SUMMARY_NAME = ".summary.bsum"
+# Unterhalb dieser Anzahl neuer Dateien lohnt sich der Prozesspool nicht
+ANALYZE_PARALLEL_THRESHOLD = 64
+ANALYZE_CHUNK_SIZE = 64
+# Protokolle ohne Spielende, die so lange (Sekunden) nicht mehr geschrieben wurden, gelten als abgestürzte Partie
+LOG_STALE_AGE = 24 * 60 * 60
+
+# Ausgang einer Partie aus Sicht des protokollierenden Spielers
+OUTCOME_WON = 1
+OUTCOME_ABORTED = 2
+OUTCOME_LOST = 3
+
+# Markierte Zelle im Protokoll: "<Wort> (<Zeile>/<Spalte>)"
+_LOG_MARK_PATTERN = re.compile(r"^(.*) \((\d+)/(\d+)\)$")
+
+def _log_timestamp(line):
+    return time.mktime(time.strptime(line[:19], "%Y-%m-%d %H:%M:%S"))
+
+# Eine Protokolldatei zeilenweise lesen; gibt (Dateiname, Start, Breite, Höhe, Ausgang, Dauer, Wörter)
+# zurück oder None, wenn die Partie noch läuft oder die Datei nicht lesbar ist. Ist die Datei ohne
+# Spielende vor stale_before zuletzt geändert worden, zählt sie als Abbruch bis zum letzten Eintrag.
+def parse_log_file(path, stale_before=None):
+    start = end = None
+    width = height = 0
+    outcome = None
+    words = []
+    last_line = None
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.rstrip("\n")
+                last_line = line
+                message = line[20:]
+                if message == "Start des Spiels":
+                    start = _log_timestamp(line)
+                elif message.startswith("Größe des Spielfelds: "):
+                    width, height = (int(value) for value in message.rsplit(" ", 1)[1].split("x"))
+                elif message == "Sieg":
+                    outcome, end = OUTCOME_WON, _log_timestamp(line)
+                elif message == "Abbruch":
+                    if outcome is None:
+                        outcome, end = OUTCOME_ABORTED, _log_timestamp(line)
+                elif message == "Ende des Spiels":
+                    if outcome is None:
+                        outcome, end = OUTCOME_LOST, _log_timestamp(line)
+                    break
+                else:
+                    match = _LOG_MARK_PATTERN.match(message)
+                    if match:
+                        words.append(match.group(1))
+        if start is not None and outcome is None and stale_before is not None and os.path.getmtime(path) < stale_before:
+            outcome, end = OUTCOME_ABORTED, _log_timestamp(last_line)
+    except (OSError, ValueError) as e:
+        logging.error(f"Fehler beim Lesen der Protokolldatei {path}: {e}")
+        return None
+    if start is None or outcome is None:
+        return None
+    return os.path.basename(path), int(start), width, height, outcome, end - start, words
+
+# Spaltenweise Zusammenfassung aller ausgewerteten Partien; Wörter werden über ein Wörterbuch als IDs gespeichert.
+# Dateiformat: Magic, Länge und JSON-Kopf (Dateien, Wörterbuch, Spaltenlängen), danach die Spalten als Rohdaten.
+class LogSummary:
+    MAGIC = b"BLSUM001"
+    # Spalten pro Partie (Name, array-Typcode); "marks" ist die Anzahl der Einträge in mark_words
+    COLUMNS = (("start", "q"), ("width", "H"), ("height", "H"), ("outcome", "B"), ("duration", "d"), ("marks", "I"))
+
+    def __init__(self):
+        self.files = []
+        self.words = []
+        self._word_ids = {}
+        self.columns = {name: array(typecode) for name, typecode in self.COLUMNS}
+        self.mark_words = array('I')
+
+    def __len__(self):
+        return len(self.files)
+
+    @classmethod
+    def load(cls, path):
+        summary = cls()
+        if not os.path.exists(path):
+            return summary
+        with open(path, 'rb') as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"Keine gültige Zusammenfassung: {path}")
+            (length,) = struct.unpack("!I", f.read(4))
+            meta = json.loads(f.read(length))
+            summary.files = meta["files"]
+            summary.words = meta["words"]
+            summary._word_ids = {word: index for index, word in enumerate(summary.words)}
+            for name, typecode in cls.COLUMNS:
+                summary.columns[name].fromfile(f, meta["rows"])
+            summary.mark_words.fromfile(f, meta["mark_count"])
+        if meta["byteorder"] != sys.byteorder:
+            for column in (*summary.columns.values(), summary.mark_words):
+                column.byteswap()
+        return summary
+
+    # Atomar schreiben, damit ein abgebrochener Lauf keine halbe Datei hinterlässt
+    def save(self, path):
+        meta = json.dumps({
+            "byteorder": sys.byteorder,
+            "rows": len(self.files),
+            "mark_count": len(self.mark_words),
+            "files": self.files,
+            "words": self.words,
+        }).encode()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(struct.pack("!I", len(meta)))
+            f.write(meta)
+            for name, _ in self.COLUMNS:
+                self.columns[name].tofile(f)
+            self.mark_words.tofile(f)
+        os.replace(tmp_path, path)
+
+    def add(self, record):
+        filename, start, width, height, outcome, duration, words = record
+        self.files.append(filename)
+        for name, value in zip(("start", "width", "height", "outcome", "duration", "marks"), (start, width, height, outcome, duration, len(words))):
+            self.columns[name].append(value)
+        for word in words:
+            word_id = self._word_ids.get(word)
+            if word_id is None:
+                word_id = self._word_ids[word] = len(self.words)
+                self.words.append(word)
+            self.mark_words.append(word_id)
+
+    # Durchschnittliche Dauer gewonnener Partien in Sekunden (None ohne Siege)
+    def average_time_to_win(self):
+        durations = [duration for duration, outcome in zip(self.columns["duration"], self.columns["outcome"]) if outcome == OUTCOME_WON]
+        return sum(durations) / len(durations) if durations else None
+
+    # Die n am häufigsten markierten Wörter als Liste aus (Wort, Anzahl)
+    def top_words(self, n=10):
+        if np is not None:
+            counts = np.bincount(np.frombuffer(self.mark_words, dtype=np.uint32), minlength=len(self.words))
+            ranking = np.argsort(counts, kind='stable')[::-1][:n]
+            return [(self.words[word_id], int(counts[word_id])) for word_id in ranking]
+        counts = Counter(self.mark_words)
+        return [(self.words[word_id], count) for word_id, count in counts.most_common(n)]
+
+    # Abbruchquote je Spielfeldgröße als {(Breite, Höhe): (Abbrüche, Partien)}
+    def abort_rate_by_size(self):
+        rates = {}
+        for width, height, outcome in zip(self.columns["width"], self.columns["height"], self.columns["outcome"]):
+            aborted, total = rates.get((width, height), (0, 0))
+            rates[(width, height)] = (aborted + (outcome == OUTCOME_ABORTED), total + 1)
+        return dict(sorted(rates.items()))
+
+# Nur Protokolldateien auswerten, die noch nicht in der Zusammenfassung stehen; große Mengen parallel im Prozesspool
+def update_log_summary(logdir, summary_path=None, rebuild=False, stale_age=LOG_STALE_AGE):
+    summary_path = summary_path or os.path.join(logdir, LOG_SUMMARY_NAME)
+    stale_before = time.time() - stale_age
+    summary = LogSummary() if rebuild else LogSummary.load(summary_path)
+    known = set(summary.files)
+    new_files = sorted(os.path.join(logdir, name) for name in os.listdir(logdir)
+                       if name.endswith(".txt") and name not in known)
+    if len(new_files) >= ANALYZE_PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor() as executor:
+            records = list(executor.map(parse_log_file, new_files, itertools.repeat(stale_before), chunksize=ANALYZE_CHUNK_SIZE))
+    else:
+        records = [parse_log_file(path, stale_before) for path in new_files]
+    added = 0
+    for record in records:
+        if record is not None:
+            summary.add(record)
+            added += 1
+    if added or rebuild:
+        summary.save(summary_path)
+    return summary, added, len(new_files) - added
+
+# Zusammenfassung aktualisieren und die Standardabfragen ausgeben
+def run_analysis(logdir, top=10, rebuild=False):
+    if not os.path.isdir(logdir):
+        print(f"Protokollverzeichnis nicht gefunden: {logdir}")
+        return False
+    start = time.perf_counter()
+    try:
+        summary, added, skipped = update_log_summary(logdir, rebuild=rebuild)
+    except (OSError, ValueError) as e:
+        logging.error(f"Fehler beim Aktualisieren der Zusammenfassung: {e}")
+        return False
+    update_time = time.perf_counter() - start
+    print(f"{added} neue Protokolle ausgewertet, {skipped} unvollständig übersprungen, {len(summary)} Partien insgesamt ({update_time * 1000:.1f} ms).")
+
+    start = time.perf_counter()
+    average = summary.average_time_to_win()
+    words = summary.top_words(top)
+    rates = summary.abort_rate_by_size()
+    query_time = time.perf_counter() - start
+
+    print(f"Durchschnittliche Zeit bis zum Sieg: {'-' if average is None else f'{average:.1f} s'}")
+    print(f"Die {top} am häufigsten markierten Wörter:")
+    for word, count in words:
+        print(f"  {count:>8}  {word}")
+    print("Abbruchquote nach Spielfeldgröße:")
+    for (width, height), (aborted, total) in rates.items():
+        print(f"  {width}x{height}: {aborted}/{total} ({aborted / total * 100:.1f} %)")
+    print(f"Abfragen in {query_time * 1000:.1f} ms.")
+    return True
+
+# Zufällige Reihenfolge der Zahlen 0..size-1 schrittweise ziehen (Fisher-Yates), ohne die Permutation
+# vorab aufzubauen; gemerkt werden nur die bisher vertauschten Positionen
+def lazy_permutation(size, rng):
+    swapped = {}
+    for i in range(size):
+        j = rng.randrange(i, size)
+        value = swapped.get(j, j)
+        swapped[j] = swapped.pop(i, i)
+        yield value
+
+# Wartezeit zwischen zwei aufgerufenen Wörtern in Sekunden
+DEFAULT_CALL_INTERVAL = 3.0
+
+# Ausrufer: zieht Wörter ohne Zurücklegen aus dem Wortkorpus der Runde, trägt sie in die
+# Rundendatei ein (Quelle der Wahrheit für die Siegprüfung) und verteilt sie an alle Spieler
+def run_caller(roundfile, interval=DEFAULT_CALL_INTERVAL, lobby_timeout=DEFAULT_LOBBY_TIMEOUT):
+    try:
+        state = RoundState.load(roundfile)
+        if "Caller" not in state.settings:
+            print("Die Runde wurde ohne Ausrufer erstellt (beim Erstellen --caller angeben).")
+            return False
+        corpus = WordCorpus.open(state.wordfile)
+        round_id = round_id_for(roundfile)
+        min_players = int(state.settings.get("MinPlayers", DEFAULT_MIN_PLAYERS))
+        deadline = time.monotonic() + lobby_timeout
+        while len(state.players) < min_players and not state.finished:
+            if time.monotonic() > deadline:
+                print("Nicht genügend Spieler beigetreten, der Ausrufer wird beendet.")
+                return False
+            time.sleep(EVENT_LOOP_TIMEOUT)
+            state = RoundState.load(roundfile)
+
+        # Die Aufrufreihenfolge folgt aus dem Seed der Runde und ist damit nachvollziehbar; nach einem
+        # Neustart des Ausrufers wird dieselbe Reihenfolge gezogen und bereits aufgerufene Wörter übersprungen
+        called = set(state.called)
+        rng = random.Random(f"{state.settings['Seed']}:calls")
+        print(f"Ausrufer gestartet ({len(corpus) - len(called)} Wörter, alle {interval} Sekunden).")
+        for index in lazy_permutation(len(corpus), rng):
+            word = corpus.word(index)
+            if word in called:
+                continue
+            if not record_call(roundfile, word):
+                print("Die Runde ist beendet.")
+                return True
+            called.add(word)
+            queues = [create_message_queue(f"/mq_{name}") for name in RoundState.load(roundfile).players]
+            broadcast_message([mq for mq in queues if mq is not None], make_message(MSG_CALL, NO_SENDER, round_id, word.encode()))
+            print(f"Aufgerufen: {word}")
+            time.sleep(interval)
+        print("Alle Wörter wurden aufgerufen.")
+        return True
+    except KeyboardInterrupt:
+        return False
+    except Exception as e:
+        logging.error(f"Fehler beim Ausrufen: {e}")
+        return False
+
+# Standardpfad des Unix-Sockets im Servermodus
+DEFAULT_SERVER_SOCKET = "/tmp/bingo.sock"
+
+# Rahmen im Servermodus: 2 Byte Länge gefolgt von einer kodierten Nachricht
+FRAME_HEADER = struct.Struct("!H")
+
+# Warteschlange für noch nicht angenommene Verbindungen (viele Spieler treten gleichzeitig bei)
+SERVER_BACKLOG = 4096
+
+# Clients, deren Sendepuffer diese Größe überschreitet, gelten als zu langsam und werden getrennt
+SERVER_WRITE_BUFFER_LIMIT = 64 * 1024
+
+def frame_message(message):
+    data = encode_message(message)
+    return FRAME_HEADER.pack(len(data)) + data
+
+async def read_frame(reader):
+    header = await reader.readexactly(FRAME_HEADER.size)
+    (length,) = FRAME_HEADER.unpack(header)
+    return decode_message(await reader.readexactly(length))
+
+# Runde im Speicher des Servers
+class ServerRound:
+    def __init__(self, name, max_players):
+        self.name = name
+        self.round_id = zlib.crc32(name.encode())
+        self.max_players = max_players
+        # Spielername -> StreamWriter, in Beitrittsreihenfolge
+        self.players = {}
+        self.finished = False
+
+    def check_join(self, player_name):
+        if self.finished:
+            return JOIN_FINISHED
+        if self.max_players and len(self.players) >= self.max_players:
+            return JOIN_FULL
+        if player_name in self.players:
+            return JOIN_NAME_TAKEN
+        return JOIN_OK
+
+# Zentraler Spielserver: hält alle Runden im Speicher und übernimmt das Fan-out selbst.
+# create und join sprechen den Server noch nicht an, sie laufen weiterhin über Rundendateien und
+# Warteschlangen; das Socket-Protokoll nutzen bisher nur die Clients des Lasttests.
+class GameServer:
+    def __init__(self, socket_path=DEFAULT_SERVER_SOCKET):
+        self.socket_path = socket_path
+        self.rounds = {}
+        self.messages_in = 0
+        self.messages_out = 0
+        self._server = None
+        self._handlers = {
+            MSG_JOIN: self._handle_join,
+            MSG_WON: self._handle_finish,
+            MSG_ABORTED: self._handle_finish,
+        }
+
+    # Einen vorhandenen Socket nur entfernen, wenn dort niemand mehr lauscht
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            if await socket_in_use(self.socket_path):
+                raise RuntimeError(f"Auf {self.socket_path} lauscht bereits ein anderer Prozess.")
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path, backlog=SERVER_BACKLOG)
+        logging.debug("Spielserver lauscht auf %s", self.socket_path)
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Spielserver läuft auf {self.socket_path}. Beenden mit Strg+C.")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _send(self, writer, data):
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > SERVER_WRITE_BUFFER_LIMIT:
+            logging.error("Client ist zu langsam, Verbindung wird getrennt.")
+            writer.close()
+            return
+        writer.write(data)
+        self.messages_out += 1
+
+    # Nachricht einmal kodieren und an alle Spieler der Runde schreiben
+    def _fanout(self, server_round, message, exclude=None):
+        data = frame_message(message)
+        for name, writer in server_round.players.items():
+            if name != exclude:
+                self._send(writer, data)
+
+    def _handle_join(self, message, writer, session):
+        fields = unpack_fields(message.payload)
+        if len(fields) < 2 or session.get("round") is not None:
+            self._send(writer, frame_message(make_message(MSG_ERROR, NO_SENDER, message.round_id, pack_fields("bad_request"))))
+            return
+        round_name, player_name = fields[0], fields[1]
+        max_players = int(fields[2]) if len(fields) > 2 and fields[2] else 0
+        server_round = self.rounds.get(round_name)
+        if server_round is None:
+            server_round = self.rounds[round_name] = ServerRound(round_name, max_players)
+        result = server_round.check_join(player_name)
+        if result != JOIN_OK:
+            self._send(writer, frame_message(make_message(MSG_ERROR, NO_SENDER, server_round.round_id, pack_fields(result))))
+            return
+        sender_id = len(server_round.players)
+        server_round.players[player_name] = writer
+        session.update(round=server_round, player=player_name, sender=sender_id)
+        self._send(writer, frame_message(make_message(MSG_JOIN_ACK, sender_id, server_round.round_id, pack_fields(*server_round.players))))
+        self._fanout(server_round, make_message(MSG_PLAYER_JOINED, sender_id, server_round.round_id, player_name.encode()), exclude=player_name)
+
+    # Sieg oder Abbruch: nur die erste Meldung beendet die Runde und wird verteilt
+    def _handle_finish(self, message, writer, session):
+        server_round = session.get("round")
+        if server_round is None or server_round.finished:
+            return
+        server_round.finished = True
+        self._fanout(server_round, make_message(message.type, session["sender"], server_round.round_id), exclude=session["player"])
+
+    def _leave(self, session):
+        server_round = session.get("round")
+        if server_round is None:
+            return
+        server_round.players.pop(session["player"], None)
+        if not server_round.finished:
+            server_round.finished = True
+            self._fanout(server_round, make_message(MSG_ABORTED, session["sender"], server_round.round_id))
+        if not server_round.players:
+            self.rounds.pop(server_round.name, None)
+
+    async def _handle_client(self, reader, writer):
+        session = {}
+        try:
+            while True:
+                message = await read_frame(reader)
+                self.messages_in += 1
+                handler = self._handlers.get(message.type)
+                if handler is None:
+                    logging.error(f"Unbekannter Nachrichtentyp: {message.type}")
+                    continue
+                handler(message, writer, session)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            logging.error(f"Fehler im Spielserver: {e}")
+        finally:
+            self._leave(session)
+            writer.close()
+
+# Prüfen, ob auf einem Unix-Socket bereits ein Prozess Verbindungen annimmt
+async def socket_in_use(socket_path):
+    try:
+        _, writer = await asyncio.open_unix_connection(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    writer.close()
+    return True
+
+# Spielserver starten und bis zum Abbruch laufen lassen
+def run_server(socket_path):
+    raise_fd_limit()
+    server = GameServer(socket_path)
+    try:
+        asyncio.run(server.serve_forever())
+    except RuntimeError as e:
+        print(e)
+        return False
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Den Socket nur entfernen, wenn dieser Prozess ihn angelegt hat
+        if server._server is not None and os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return True
+
+# Offene Dateideskriptoren auf das erlaubte Maximum anheben (für viele Verbindungen)
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+# Perzentil einer sortierten Liste
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+# Höchste Wartezeit (Sekunden) jeder Phase eines Lasttest-Clients: Verbinden, Beitritt, Warten auf
+# Mitspieler, Zustellung des Siegs. Überschreitungen zählen als Client-Fehler statt den Lasttest anzuhalten.
+LOAD_TEST_PHASE_TIMEOUT = 10.0
+
+# Ein Lasttest-Client: beitreten, auf alle Mitspieler warten, dann Sieg empfangen oder melden.
+# Scheitert ein Client, gibt er seinen Platz in der Semaphore der Runde trotzdem frei und wird in
+# results["failed"] gezählt, damit der Gewinner nicht auf ihn wartet.
+async def _load_test_client(socket_path, round_name, player_name, players_per_round, all_joined, win_sent, results, timeout=LOAD_TEST_PHASE_TIMEOUT):
+    writer = None
+    released = False
+
+    # Nächste Nachricht lesen; ein Abbruch der Runde beendet den Client sofort
+    async def next_message(reader):
+        message = await read_frame(reader)
+        if message.type == MSG_ABORTED:
+            raise RuntimeError("Runde wurde abgebrochen")
+        return message
+
+    async def wait_for_joins(reader, joined):
+        while joined < players_per_round:
+            message = await next_message(reader)
+            joined += message.type == MSG_PLAYER_JOINED
+
+    async def wait_for_peers():
+        for _ in range(players_per_round):
+            await all_joined[round_name].acquire()
+
+    async def wait_for_delivery():
+        while results["won_received"].get(round_name, 0) + results["failed"].get(round_name, 0) < players_per_round - 1:
+            await asyncio.sleep(0.01)
+
+    async def wait_for_win(reader):
+        message = await next_message(reader)
+        while message.type != MSG_WON:
+            message = await next_message(reader)
+        return message
+
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(socket_path), timeout)
+        writer.write(frame_message(make_message(MSG_JOIN, NO_SENDER, 0, pack_fields(round_name, player_name, players_per_round))))
+        await asyncio.wait_for(writer.drain(), timeout)
+        ack = await asyncio.wait_for(read_frame(reader), timeout)
+        if ack.type != MSG_JOIN_ACK:
+            raise RuntimeError(f"Beitritt abgelehnt: {unpack_fields(ack.payload)}")
+        await asyncio.wait_for(wait_for_joins(reader, len(unpack_fields(ack.payload))), timeout)
+        all_joined[round_name].release()
+        released = True
+        if ack.sender == 0:
+            await asyncio.wait_for(wait_for_peers(), timeout)
+            win_sent[round_name] = time.perf_counter()
+            writer.write(frame_message(make_message(MSG_WON, ack.sender, ack.round_id)))
+            await asyncio.wait_for(writer.drain(), timeout)
+            # Der Gewinner wartet, bis alle anderen den Sieg erhalten haben oder gescheitert sind
+            await asyncio.wait_for(wait_for_delivery(), timeout)
+        else:
+            message = await asyncio.wait_for(wait_for_win(reader), timeout)
+            if message.round_id != ack.round_id:
+                raise RuntimeError("Sieg aus einer fremden Runde empfangen")
+            results["latencies"].append(time.perf_counter() - win_sent[round_name])
+            results["won_received"][round_name] = results["won_received"].get(round_name, 0) + 1
+    except Exception:
+        results["failed"][round_name] = results["failed"].get(round_name, 0) + 1
+        if not released:
+            all_joined[round_name].release()
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+
+# Lasttest: viele Runden mit vielen Spielern gleichzeitig gegen einen Server im selben Prozess
+async def _run_load_test(socket_path, rounds, players_per_round):
+    server = GameServer(socket_path)
+    await server.start()
+    all_joined = {f"round{r}": asyncio.Semaphore(0) for r in range(rounds)}
+    win_sent = {}
+    results = {"latencies": [], "won_received": {}, "failed": {}}
+    start = time.perf_counter()
+    try:
+        outcomes = await asyncio.gather(*(
+            _load_test_client(socket_path, f"round{r}", f"player{p}", players_per_round, all_joined, win_sent, results)
+            for r in range(rounds) for p in range(players_per_round)
+        ), return_exceptions=True)
+    finally:
+        duration = time.perf_counter() - start
+        await server.stop()
+    latencies = sorted(results["latencies"])
+    expected = rounds * (players_per_round - 1)
+    return {
+        "rounds": rounds,
+        "players": rounds * players_per_round,
+        "duration_s": duration,
+        "messages_in": server.messages_in,
+        "messages_out": server.messages_out,
+        "messages_per_s": (server.messages_in + server.messages_out) / duration if duration else 0.0,
+        "client_errors": sum(isinstance(outcome, Exception) for outcome in outcomes),
+        "wins_delivered": len(latencies),
+        "wins_expected": expected,
+        "win_latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "win_latency_p95_ms": percentile(latencies, 0.95) * 1000,
+        "win_latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "win_latency_max_ms": (latencies[-1] * 1000) if latencies else 0.0,
+    }
+
+def run_load_test(socket_path, rounds, players_per_round):
+    limit = raise_fd_limit()
+    needed = rounds * players_per_round * 2 + 64
+    if limit < needed:
+        print(f"Dateideskriptor-Limit zu niedrig ({limit}, benötigt {needed}).")
+        return None
+    try:
+        report = asyncio.run(_run_load_test(socket_path, rounds, players_per_round))
+    except RuntimeError as e:
+        print(e)
+        return None
+    for key, value in report.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+    if report["client_errors"] or report["wins_delivered"] != report["wins_expected"]:
+        print("Lasttest fehlgeschlagen: nicht alle Siegmeldungen wurden zugestellt.")
+    else:
+        print("Lasttest erfolgreich.")
+    return report
+
+# Event, das sich merkt, wann es zum ersten Mal gesetzt wurde (für Latenzmessungen)
+class TimedEvent(threading.Event):
+    set_at = None
+
+    def set(self):
+        if self.set_at is None:
+            self.set_at = time.perf_counter()
+        super().set()
+
+# Hülle um eine Nachrichtenwarteschlange, die gesendete und empfangene Nachrichten pro Runde zählt
+class CountingQueue:
+    def __init__(self, mq, counters, lock):
+        self.mq = mq
+        self.counters = counters
+        self.lock = lock
+
+    def send(self, *args, **kwargs):
+        self.mq.send(*args, **kwargs)
+        with self.lock:
+            self.counters["sent"] += 1
+
+    def receive(self, *args, **kwargs):
+        result = self.mq.receive(*args, **kwargs)
+        with self.lock:
+            self.counters["received"] += 1
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.mq, name)
+
+# Maximale Laufzeit einer Simulation, bevor nicht beendete Bots aufgegeben werden (Sekunden)
+SIMULATION_TIMEOUT = 120.0
+
+# Ein Bot markiert Zellen seiner Karte in zufälliger Reihenfolge, bis jemand gewonnen hat
+def _simulation_bot(roundfile, player_name, players, all_player_queues, rate, game_won_event, game_aborted_event, stats, lock, rng):
+    cards = read_bingo_cards(roundfile, player_name)
+    card_state = CardState.from_card(cards, WinPatterns.for_round(RoundState.load(roundfile)))
+    cells = [(row, col) for row in range(len(cards)) for col in range(len(cards[0])) if (row, col) not in card_state]
+    rng.shuffle(cells)
+    interval = 1.0 / rate if rate > 0 else 0
+    sender_id = sender_id_for(players, player_name)
+    for row, col in cells:
+        if game_won_event.wait(interval) or game_aborted_event.is_set():
+            return
+        card_state.mark(row, col)
+        with lock:
+            stats["marks"] += 1
+        if check_win(cards, card_state):
+            if finish_round(roundfile):
+                stats["winner"] = player_name
+                stats["win_sent_at"] = time.perf_counter()
+                broadcast_message(all_player_queues, make_message(MSG_WON, sender_id, round_id_for(roundfile)))
+            return
+
+# Simulation: players_per_round Bots in jeder von rounds Runden über die echten Warteschlangen spielen lassen
+def run_simulation(rounds, players_per_round, rate, height, width, wordfile):
+    soft, hard = resource.getrlimit(resource.RLIMIT_MSGQUEUE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_MSGQUEUE, (hard, hard))
+    workdir = tempfile.mkdtemp(prefix="bingo-sim-")
+    prefix = f"sim{os.getpid()}"
+    lock = threading.Lock()
+    rng = random.Random()
+    simulation = []
+    queue_names = []
+    try:
+        for r in range(rounds):
+            roundfile = os.path.join(workdir, f"round{r}.txt")
+            if not (create_round_file(roundfile, height, width, wordfile, players_per_round, min_players=players_per_round) and create_round_cards(roundfile)):
+                return None
+            round_id = round_id_for(roundfile)
+            stats = {"roundfile": roundfile, "marks": 0, "sent": 0, "received": 0, "winner": None, "win_sent_at": None}
+            roster, all_player_queues, bots = [], [], []
+            for p in range(players_per_round):
+                player_name = f"{prefix}r{r}p{p}"
+                join_round(roundfile, player_name)
+                mq = create_message_queue(f"/mq_{player_name}")
+                if mq is None:
+                    print("Nachrichtenwarteschlange konnte nicht erstellt werden (Limit erreicht?).")
+                    return None
+                queue_names.append(f"/mq_{player_name}")
+                mq = CountingQueue(mq, stats, lock)
+                roster.append(player_name)
+                all_player_queues.append(mq)
+                bot = {"name": player_name, "won": TimedEvent(), "aborted": threading.Event()}
+                log_file = os.path.join(workdir, f"{player_name}.txt")
+                listener = threading.Thread(target=listen_for_messages, args=(mq, bot["won"], bot["aborted"], all_player_queues, list(roster), log_file, round_id), daemon=True)
+                listener.start()
+                broadcast_message(all_player_queues, make_message(MSG_PLAYER_JOINED, p, round_id, player_name.encode()))
+                bots.append(bot)
+            simulation.append((stats, roster, all_player_queues, bots))
+
+        start = time.perf_counter()
+        threads = []
+        for stats, roster, all_player_queues, bots in simulation:
+            for bot in bots:
+                thread = threading.Thread(target=_simulation_bot, args=(stats["roundfile"], bot["name"], roster, all_player_queues, rate, bot["won"], bot["aborted"], stats, lock, random.Random(rng.random())), daemon=True)
+                thread.start()
+                threads.append(thread)
+        deadline = time.monotonic() + SIMULATION_TIMEOUT
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        # Den Listenern kurz Zeit geben, die letzten Siegmeldungen zu verarbeiten
+        for stats, roster, all_player_queues, bots in simulation:
+            for bot in bots:
+                bot["won"].wait(max(0.0, min(1.0, deadline - time.monotonic())))
+        duration = time.perf_counter() - start
+
+        latencies = []
+        missed = 0
+        for stats, roster, all_player_queues, bots in simulation:
+            for bot in bots:
+                if bot["name"] == stats["winner"]:
+                    continue
+                if stats["win_sent_at"] is None or bot["won"].set_at is None:
+                    missed += 1
+                else:
+                    latencies.append(bot["won"].set_at - stats["win_sent_at"])
+        latencies.sort()
+        total_marks = sum(stats["marks"] for stats, *_ in simulation)
+        total_messages = sum(stats["sent"] for stats, *_ in simulation)
+        report = {
+            "rounds": rounds,
+            "players": rounds * players_per_round,
+            "duration_s": duration,
+            "marks": total_marks,
+            "marks_per_s": total_marks / duration if duration else 0.0,
+            "messages_sent": total_messages,
+            "messages_received": sum(stats["received"] for stats, *_ in simulation),
+            "messages_per_s": total_messages / duration if duration else 0.0,
+            "wins_missed": missed,
+            "win_latency_p50_ms": percentile(latencies, 0.50) * 1000,
+            "win_latency_p95_ms": percentile(latencies, 0.95) * 1000,
+            "win_latency_p99_ms": percentile(latencies, 0.99) * 1000,
+            "win_latency_max_ms": (latencies[-1] * 1000) if latencies else 0.0,
+            "per_round": [{"round": r, "winner": stats["winner"], "marks": stats["marks"], "sent": stats["sent"], "received": stats["received"]}
+                          for r, (stats, *_) in enumerate(simulation)],
+        }
+        for key, value in report.items():
+            if key != "per_round":
+                print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+        print("Runde  Markierungen  gesendet  empfangen  Gewinner")
+        for entry in report["per_round"]:
+            print(f"{entry['round']:>5}  {entry['marks']:>12}  {entry['sent']:>8}  {entry['received']:>9}  {entry['winner']}")
+        return report
+    finally:
+        for name in queue_names:
+            QUEUES.release(name, unlink=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+# Virtueller curses-Bildschirm für Messungen ohne Terminal
+class VirtualScreen:
+    def __init__(self, rows=10000, cols=10000):
+        self.rows = rows
+        self.cols = cols
+        self.cells = {}
+        self.bytes_written = 0
+
+    def addstr(self, y, x, text, attr=0):
+        if y >= self.rows or x + len(text) > self.cols:
+            raise curses.error("addstr() returned ERR")
+        self.cells[(y, x)] = (text, attr)
+        self.bytes_written += len(text.encode())
+
+    def erase(self):
+        self.cells.clear()
+
+    def noutrefresh(self):
+        pass
+
+    def getmaxyx(self):
+        return self.rows, self.cols
+
+# Standarddatei für gespeicherte Benchmark-Baselines und erlaubte Verschlechterung (0.25 = 25 %)
+# Die Baseline liegt versioniert neben main.py und wird mit "main.py benchmark --save_baseline" neu erzeugt,
+# die Werte gelten nur für die Maschine, auf der sie gemessen wurden
+DEFAULT_BENCHMARK_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_BENCHMARK_THRESHOLD = 0.25
+
+# Mittlere Laufzeit pro Aufruf in Sekunden (bestes von repeat Durchläufen)
+def measure(func, repeat=3):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+# Wortdatei mit count eindeutigen Wörtern anlegen
+def _write_benchmark_corpus(workdir, count):
+    path = os.path.join(workdir, f"corpus{count}.txt")
+    with open(path, 'w') as f:
+        f.writelines(f"wort{i}\n" for i in range(count))
+    return path
+
+# Die Gruppen bekommen wanted(Name) und bereiten nur Fälle vor, die der Filter auswählt
+def _benchmark_check_win(cases, rng, wanted):
+    for size in (5, 25, 100):
+        cards = [["x"] * size for _ in range(size)]
+        for fill in (0.25, 0.75):
+            suffix = f"{size}x{size}/fill{int(fill * 100)}"
+            if not any(wanted(f"{group}/{suffix}") for group in ("check_win/set", "check_win/state", "card_state/toggle+check", "patterns/closest")):
+                continue
+            cells = [(row, col) for row in range(size) for col in range(size)]
+            selected = set(rng.sample(cells, int(len(cells) * fill)))
+            card_state = CardState.from_indices(size, size, selected)
+            cases.append((f"check_win/set/{size}x{size}/fill{int(fill * 100)}", lambda cards=cards, selected=selected: check_win(cards, selected)))
+            cases.append((f"check_win/state/{size}x{size}/fill{int(fill * 100)}", lambda cards=cards, card_state=card_state: check_win(cards, card_state)))
+            row, col = rng.choice(cells)
+            cases.append((f"card_state/toggle+check/{size}x{size}/fill{int(fill * 100)}",
+                          lambda cards=cards, card_state=card_state, row=row, col=col: (card_state.toggle(row, col), check_win(cards, card_state))))
+            # Linien plus mehrere Muster: Sieg prüfen und fehlende Zellen bestimmen
+            patterns = WinPatterns.compile("lines,four_corners,x,full_house", size, size)
+            pattern_state = CardState.from_indices(size, size, selected, patterns)
+            cases.append((f"patterns/closest/{size}x{size}/fill{int(fill * 100)}",
+                          lambda pattern_state=pattern_state: (pattern_state.has_won(), pattern_state.closest_pattern())))
+
+def _benchmark_cards(cases, workdir, wanted):
+    for count in (1000, 100000, 1000000):
+        if not (wanted(f"create_bingo_card/corpus{count}/5x5") or wanted(f"read_bingo_cards/corpus{count}/5x5")):
+            continue
+        wordfile = _write_benchmark_corpus(workdir, count)
+        corpus = WordCorpus.open(wordfile)
+        cases.append((f"create_bingo_card/corpus{count}/5x5", lambda corpus=corpus: create_bingo_card(5, 5, corpus)))
+        roundfile = os.path.join(workdir, f"cards{count}.txt")
+        create_round_file(roundfile, 5, 5, wordfile, 2, seed=1)
+        create_round_cards(roundfile)
+        join_round(roundfile, "alice")
+        cases.append((f"read_bingo_cards/corpus{count}/5x5", lambda roundfile=roundfile: read_bingo_cards(roundfile, "alice")))
+
+def _benchmark_roundfile(cases, workdir, wanted):
+    for count in (10, 100, 1000):
+        if not any(wanted(f"{func}/players{count}/{mode}") for func in ("check_access", "read_players_from_roundfile") for mode in ("cached", "cold")):
+            continue
+        roundfile = os.path.join(workdir, f"players{count}.txt")
+        create_round_file(roundfile, 5, 5, "buzzwords", count + 1, seed=1)
+        append_to_roundfile(roundfile, [f"player:p{i}" for i in range(count)])
+
+        def cold(func, roundfile=roundfile):
+            RoundState._cache.pop(os.path.abspath(roundfile), None)
+            return func(roundfile, "neu")
+
+        cases.append((f"check_access/players{count}/cached", lambda roundfile=roundfile: check_access(roundfile, "neu")))
+        cases.append((f"check_access/players{count}/cold", lambda cold=cold: cold(check_access)))
+        cases.append((f"read_players_from_roundfile/players{count}/cached", lambda roundfile=roundfile: read_players_from_roundfile(roundfile)))
+        cases.append((f"read_players_from_roundfile/players{count}/cold", lambda cold=cold: cold(lambda roundfile, _: read_players_from_roundfile(roundfile))))
+
+def _benchmark_render(cases, wanted):
+    for size in (5, 25, 100):
+        if not (wanted(f"render/full_frame/{size}x{size}") or wanted(f"render/cursor_move/{size}x{size}")):
+            continue
+        cards = [[f"wort{row}-{col}" for col in range(size)] for row in range(size)]
+        screen = VirtualScreen()
+        renderer = CardRenderer(screen, cards, doupdate=lambda: None)
+        renderer.set_header([[("Spieler im Spiel:", 0)]])
+        renderer.render(lambda row, col: 0)
+        cursor = [0]
+
+        def full_frame(renderer=renderer):
+            renderer.invalidate_all()
+            renderer.render(lambda row, col: cursor[0])
+            cursor[0] ^= 1
+
+        def cursor_move(renderer=renderer, size=size):
+            previous = cursor[0]
+            cursor[0] = (cursor[0] + 1) % size
+            renderer.invalidate(0, previous)
+            renderer.invalidate(0, cursor[0])
+            renderer.render(lambda row, col: 1 if (row, col) == (0, cursor[0]) else 0)
+
+        cases.append((f"render/full_frame/{size}x{size}", full_frame))
+        cases.append((f"render/cursor_move/{size}x{size}", cursor_move))
+
+    if not wanted("render/viewport_scroll/100x100"):
+        return
+
+    # Großes Spielfeld in einem 80x24-Terminal: Cursor läuft über die Zeile und verschiebt den Ausschnitt
+    cards = [[f"wort{row}-{col}" for col in range(100)] for row in range(100)]
+    renderer = CardRenderer(VirtualScreen(24, 80), cards, doupdate=lambda: None)
+    renderer.set_header([[("Spieler im Spiel:", 0)]])
+    renderer.render(lambda row, col: 0)
+    position = [0]
+
+    def viewport_scroll(renderer=renderer):
+        previous = position[0]
+        position[0] = (position[0] + 1) % 100
+        renderer.invalidate(0, previous)
+        renderer.invalidate(0, position[0])
+        renderer.follow(0, position[0])
+        renderer.render(lambda row, col: 1 if (row, col) == (0, position[0]) else 0, renderer.viewport_summary)
+
+    cases.append(("render/viewport_scroll/100x100", viewport_scroll))
+
+# Alle Benchmarks ausführen; gibt {Name: Sekunden pro Aufruf} zurück
+def run_benchmarks(name_filter=None):
+    rng = random.Random(0)
+    random.seed(0)
+    workdir = tempfile.mkdtemp(prefix="bingo-bench-")
+    queue_name = f"/bingo_bench_{os.getpid()}"
+    mq = create_message_queue(queue_name)
+    # Indizes der temporären Korpora landen im Arbeitsverzeichnis des Benchmarks, nicht in ./.wordindex
+    previous_index_root = WordCorpus.index_root
+    WordCorpus.index_root = os.path.join(workdir, '.wordindex')
+    previous_level = logging.getLogger().level
+    logging.getLogger().setLevel(logging.WARNING)
+    try:
+        def wanted(name):
+            return not name_filter or name_filter in name
+
+        cases = []
+        _benchmark_check_win(cases, rng, wanted)
+        _benchmark_cards(cases, workdir, wanted)
+        _benchmark_roundfile(cases, workdir, wanted)
+        message = make_message(MSG_WON, 0, 0)
+        cases.append(("mq/send+receive", lambda: (send_message(mq, message), receive_message(mq))))
+        _benchmark_render(cases, wanted)
+        results = {}
+        for name, func in cases:
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = measure(func)
+        return results
+    finally:
+        logging.getLogger().setLevel(previous_level)
+        cleanup_message_queue(mq, queue_name)
+        WordCorpus.index_root = previous_index_root
+        with WordCorpus._open_lock:
+            for path in [path for path in WordCorpus._open_corpora if path.startswith(workdir)]:
+                WordCorpus._open_corpora.pop(path)[1].close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+# Ergebnisse mit der Baseline vergleichen; gibt die Namen der Regressionen zurück
+def compare_benchmarks(results, baseline, threshold):
+    regressions = []
+    print(f"{'Benchmark':<50} {'aktuell':>12} {'Baseline':>12} {'Faktor':>8}")
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference:
+            ratio = seconds / reference
+            marker = "  REGRESSION" if ratio > 1 + threshold else ""
+            if marker:
+                regressions.append(name)
+            print(f"{name:<50} {seconds * 1e6:>10.2f}us {reference * 1e6:>10.2f}us {ratio:>7.2f}x{marker}")
+        else:
+            print(f"{name:<50} {seconds * 1e6:>10.2f}us {'-':>12} {'-':>8}")
+    return regressions
+
+def run_benchmark_suite(baseline_path, threshold, save_baseline=False, name_filter=None):
+    results = run_benchmarks(name_filter)
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    regressions = compare_benchmarks(results, baseline, threshold)
+    if save_baseline:
+        baseline.update(results)
+        with open(baseline_path, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline gespeichert: {baseline_path}")
+    if regressions:
+        print(f"{len(regressions)} Benchmark(s) mehr als {threshold:.0%} langsamer als die Baseline.")
+    return regressions
+
+# Benutzerinput erhalten
+def get_input(prompt, input_type=str, valid_range=None, valid_options=None):
+    while True:
+        try:
+            user_input = input_type(input(prompt).strip())
+            if valid_range and user_input not in valid_range:
+                raise ValueError(f"Eingabe muss im Bereich liegen: {valid_range}")
+            if valid_options and user_input not in valid_options:
+                raise ValueError(f"Eingabe muss eine der folgenden Optionen sein: {valid_options}")
+            return user_input
+        except ValueError as e:
+            print(e)
+
+# Argumente parsen
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Multiplayer Bingo Spiel")
+    parser.add_argument('action', type=str, choices=['create', 'join', 'call', 'watch', 'server', 'loadtest', 'simulate', 'benchmark', 'reap', 'analyze'], help='Aktion: Spiel erstellen oder beitreten, Wörter ausrufen, Runde beobachten, Spielserver starten, Lasttest, Bot-Simulation oder Benchmarks ausführen, verwaiste Warteschlangen und Anzeigetafeln löschen, Protokolle auswerten')
+    parser.add_argument('roundfile', type=str, nargs='?', help='Name der Rundendatei (erforderlich zum Erstellen und Beitreten)')
+    parser.add_argument('player_name', type=str, nargs='?', help='Name des Spielers (erforderlich zum Erstellen und Beitreten)')
+    parser.add_argument('-x', '--xaxis', type=int, help='Anzahl der Spalten der Bingokarte (erforderlich zum Erstellen)', required=False)
+    parser.add_argument('-y', '--yaxis', type=int, help='Anzahl der Zeilen der Bingokarte (erforderlich zum Erstellen)', required=False)
+    parser.add_argument('-w', '--wordfile', type=str, help='Pfad zur Wortdatei (erforderlich zum Erstellen)', required=False)
+    parser.add_argument('-m', '--max_players', type=int, help='Maximale Anzahl an Spielern (erforderlich zum Erstellen)', required=False)
+    parser.add_argument('-s', '--seed', type=int, help='Seed für die Kartenerzeugung (optional, sonst zufällig)', required=False)
+    parser.add_argument('-o', '--max_overlap', type=int, help='Maximale Anzahl gemeinsamer Wörter zweier Karten (optional)', required=False)
+    parser.add_argument('-p', '--patterns', type=str, default=DEFAULT_PATTERNS, help='Gewinnmuster, kommagetrennt: lines, four_corners, x, full_house, blackout, mask:101/010/101')
+    parser.add_argument('--caller', action='store_true', help='Runde mit Ausrufer erstellen: aufgerufene Wörter werden automatisch markiert und Siege geprüft')
+    parser.add_argument('--call_interval', type=float, default=DEFAULT_CALL_INTERVAL, help='Sekunden zwischen zwei aufgerufenen Wörtern')
+    parser.add_argument('--watch_interval', type=float, default=DEFAULT_WATCH_INTERVAL, help='Aktualisierungsintervall der Zuschaueransicht in Sekunden')
+    parser.add_argument('--heartbeat_interval', type=float, default=DEFAULT_HEARTBEAT_INTERVAL, help='Sekunden zwischen zwei Lebenszeichen eines Spielers')
+    parser.add_argument('--heartbeat_misses', type=int, default=DEFAULT_HEARTBEAT_MISSES, help='Verpasste Lebenszeichen, nach denen ein Spieler als verschwunden gilt')
+    parser.add_argument('--on_player_gone', type=str, choices=[PLAYER_GONE_CONTINUE, PLAYER_GONE_ABORT], default=PLAYER_GONE_CONTINUE, help='Verhalten, wenn ein Spieler verschwindet: weiterspielen oder Runde abbrechen')
+    parser.add_argument('--min_players', type=int, default=DEFAULT_MIN_PLAYERS, help='Mindestanzahl an Spielern, bevor die Runde startet')
+    parser.add_argument('--lobby_timeout', type=float, default=DEFAULT_LOBBY_TIMEOUT, help='Maximale Wartezeit auf Mitspieler in Sekunden')
+    parser.add_argument('--debug', action='store_true', help='Detaillierte Debug-Ausgaben aktivieren')
+    parser.add_argument('--metrics', type=str, default=os.environ.get("BINGO_METRICS"), help='Laufzeitmetriken periodisch in diese Datei schreiben (.json oder Prometheus-Text, {pid} wird ersetzt)')
+    parser.add_argument('--metrics_interval', type=float, default=DEFAULT_METRICS_INTERVAL, help='Schreibintervall der Metrikdatei in Sekunden')
+    parser.add_argument('--socket', type=str, default=DEFAULT_SERVER_SOCKET, help='Pfad des Unix-Sockets im Servermodus und im Lasttest')
+    parser.add_argument('--rounds', type=int, default=200, help='Anzahl der Runden im Lasttest und in der Simulation')
+    parser.add_argument('--players', type=int, default=10, help='Spieler pro Runde im Lasttest und in der Simulation')
+    parser.add_argument('--rate', type=float, default=100.0, help='Markierungen pro Sekunde und Bot in der Simulation (0 = so schnell wie möglich)')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BENCHMARK_BASELINE, help='Datei mit gespeicherten Benchmark-Ergebnissen')
+    parser.add_argument('--save_baseline', action='store_true', help='Aktuelle Benchmark-Ergebnisse als Baseline speichern')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_BENCHMARK_THRESHOLD, help='Erlaubte Verschlechterung gegenüber der Baseline (0.25 = 25 %%)')
+    parser.add_argument('--bench_filter', type=str, help='Nur Benchmarks ausführen, deren Name diesen Text enthält')
+    parser.add_argument('--dry_run', action='store_true', help='Verwaiste Warteschlangen und Anzeigetafeln nur anzeigen, nicht löschen')
+    parser.add_argument('--logdir', type=str, default='logfiles', help='Verzeichnis mit den Protokolldateien für die Auswertung')
+    parser.add_argument('--top', type=int, default=10, help='Anzahl der häufigsten Wörter in der Auswertung')
+    parser.add_argument('--rebuild', action='store_true', help='Zusammenfassung der Protokolle komplett neu aufbauen')
+    parser.add_argument('--force', action='store_true', help='Auch Bingo-Warteschlangen und Anzeigetafeln ohne Besitzer-Eintrag löschen')
+    return parser.parse_args()
+
+# Hauptfunktion
+def main():
+    args = parse_arguments()
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+    if args.metrics:
+        enable_metrics(args.metrics, args.metrics_interval)
+
+    install_signal_handlers()
+
+    if args.action == 'reap':
+        reap_queues(args.dry_run, args.force)
+        return
+    if args.action == 'analyze':
+        run_analysis(args.logdir, args.top, args.rebuild)
+        return
+    if args.action == 'server':
+        run_server(args.socket)
+        return
+    if args.action == 'loadtest':
+        run_load_test(args.socket, args.rounds, args.players)
+        return
+    if args.action == 'benchmark':
+        if run_benchmark_suite(args.baseline, args.threshold, args.save_baseline, args.bench_filter):
+            sys.exit(1)
+        return
+    if args.action == 'simulate':
+        run_simulation(args.rounds, args.players, args.rate, args.yaxis or 5, args.xaxis or 5, args.wordfile or "buzzwords")
+        return
+    if args.action == 'call':
+        if not args.roundfile or not os.path.exists(args.roundfile):
+            print("Rundendatei nicht gefunden.")
+            return
+        run_caller(args.roundfile, args.call_interval, args.lobby_timeout)
+        return
+    if args.action == 'watch':
+        if not args.roundfile or not os.path.exists(args.roundfile):
+            print("Rundendatei nicht gefunden.")
+            return
+        watch_round(args.roundfile, args.watch_interval)
+        return
+    if not args.roundfile or not args.player_name:
+        print("Zum Erstellen oder Beitreten sind Rundendatei und Spielername erforderlich.")
+        return
+
+    global game_won_event
+    game_won_event = threading.Event()
+    global game_aborted_event
+    game_aborted_event = threading.Event()
+
+    try:
+        print("Willkommen zu Multiplayer Bingo!")
+
+        if args.action == 'create':
+            if not all([args.xaxis, args.yaxis, args.wordfile, args.max_players]):
+                print("Zum Erstellen eines Spiels sind die Argumente --xaxis, --yaxis, --wordfile und --max_players erforderlich.")
+                return
+            if args.heartbeat_interval <= 0 or args.heartbeat_misses < 1:
+                print("Das Heartbeat-Intervall muss positiv sein und mindestens ein verpasstes Lebenszeichen erlaubt werden.")
+                return
+
+            while True:
+                if os.path.exists(args.roundfile):
+                    print("Eine Rundendatei mit diesem Namen existiert bereits. Bitte wähle einen anderen Namen.")
+                    args.roundfile = get_input("Name der Rundendatei: ")
+                else:
+                    break
+
+            height = args.yaxis
+            width = args.xaxis
+            wordfile = args.wordfile
+            max_players = args.max_players
+            player_name = args.player_name
+            roundfile = args.roundfile
+
+            while True:
+                while not os.path.exists(wordfile):
+                    print(f"Datei nicht gefunden: {wordfile}.")
+                    choice = get_input("Möchtest du den Dateipfad erneut eingeben (ja) oder die Standard-Buzzwords-Datei verwenden (nein)? ", str, valid_options={"ja", "nein"})
+                    if choice == "ja":
+                        wordfile = get_input("Bitte gib den Pfad zu deiner Wortdatei ein: ")
+                    else:
+                        wordfile = "buzzwords"  # Ersetze dies durch den Pfad zu deiner Standard-Wortdatei
+                        break
+
+                try:
+                    WinPatterns.compile(args.patterns, height, width)
+                except ValueError as e:
+                    print(e)
+                    return
+                if len(WordCorpus.open(wordfile)) < words_needed(height, width):
+                    print(f"Nicht genügend Wörter in der Wortdatei.")
+                    width = get_input("Anzahl der Spalten der Bingokarte: ", int)
+                    height = get_input("Anzahl der Zeilen der Bingokarte: ", int)
+                else:
+                    break
+
+
+            min_players = max(1, min(args.min_players, max_players))
+            if create_round_file(roundfile, height, width, wordfile, max_players, args.seed, args.max_overlap, min_players, args.caller, args.patterns,
+                                 args.heartbeat_interval, args.heartbeat_misses, args.on_player_gone) and create_round_cards(roundfile):
+  
+                scoreboard = Scoreboard.create(roundfile, height, width, max_players)
+                lobby = RoundLobby(roundfile)
+                lobby.open()
+                create_player(roundfile, player_name)
+                mq_name = "/mq_" + player_name
+                mq = create_message_queue(mq_name)
+                QUEUES.claim(mq_name, roundfile)
+                print(f"Warten auf Mitspieler ({min_players} Spieler benötigt)...")
+                try:
+                    ready = lobby.wait_for_players(min_players, args.lobby_timeout)
+                finally:
+                    lobby.close()
+                if not ready:
+                    print("Nicht genügend Mitspieler beigetreten, die Runde wird abgebrochen.")
+                    finish_round(roundfile, aborted=True)
+                    waiting_queues = [create_message_queue(f"/mq_{name}") for name in read_players_from_roundfile(roundfile) if name != player_name]
+                    broadcast_message(waiting_queues, make_message(MSG_ABORTED, 0, round_id_for(roundfile)))
+                    cleanup_message_queue(mq, mq_name)
+                    if scoreboard is not None:
+                        scoreboard.close()
+                    return
+                print("Genügend Mitspieler sind dem Spiel beigetreten.")
+                cards = read_bingo_cards(roundfile, player_name)
+                if cards:
+                    player_queues = read_players_from_roundfile(roundfile)
+                    all_player_queues = [create_message_queue(f"/mq_{name}") for name in player_queues]
+                    display_bingo_cards(cards, player_name, game_won_event, game_aborted_event, all_player_queues, roundfile, mq, create_log_file(player_name))
+
+                    # Clean up message queues
+                    for queue_name in player_queues:
+                        cleanup_message_queue(None, f"/mq_{queue_name}")
+                    cleanup_message_queue(mq, mq_name)
+                if scoreboard is not None:
+                    scoreboard.close()
+            else:
+                remove_round_files(roundfile)
+                print("Die Runde wurde nicht erstellt.")
+
+        elif args.action == 'join':
+            roundfile = args.roundfile
+            player_name = args.player_name
+
+            while not roundfile or not os.path.exists(roundfile):
+                print("Rundendatei nicht gefunden.")
+                roundfile = get_input("Bitte gib den Pfad zur Rundendatei ein: ")
+
+            result = create_player(roundfile, player_name)
+            while result == JOIN_NAME_TAKEN:
+                print(JOIN_ERRORS[result])
+                player_name = get_input("Bitte gib einen anderen Spielernamen ein: ")
+                result = create_player(roundfile, player_name)
+            if result != JOIN_OK:
+                print(JOIN_ERRORS[result])
+                return
+
+            mq_name = "/mq_" + player_name
+            mq = create_message_queue(mq_name)
+            QUEUES.claim(mq_name, roundfile)
+            player_queues = read_players_from_roundfile(roundfile)
+            sender_id = sender_id_for(player_queues, player_name)
+            round_id = round_id_for(roundfile)
+            RoundLobby(roundfile).announce(sender_id)
+            all_player_queues = [create_message_queue(f"/mq_{name}") for name in player_queues]
+            broadcast_message(all_player_queues, make_message(MSG_PLAYER_JOINED, sender_id, round_id, player_name.encode()))
+            min_players = int(RoundState.load(roundfile).settings.get("MinPlayers", DEFAULT_MIN_PLAYERS))
+            if len(player_queues) < min_players:
+                print(f"Warten auf Mitspieler ({min_players} Spieler benötigt)...")
+                if not RoundLobby(roundfile).wait_for_players(min_players, args.lobby_timeout, mq):
+                    print("Die Runde ist nicht zustande gekommen.")
+                    cleanup_message_queue(mq, mq_name)
+                    return
+                player_queues = read_players_from_roundfile(roundfile)
+                all_player_queues = [create_message_queue(f"/mq_{name}") for name in player_queues]
+            cards = read_bingo_cards(roundfile, player_name)
+            if cards:
+                display_bingo_cards(cards, player_name, game_won_event, game_aborted_event, all_player_queues, roundfile, mq, create_log_file(player_name))
+
+                # Clean up message queues
+                for queue_name in player_queues:
+                    cleanup_message_queue(None, f"/mq_{queue_name}")
+                cleanup_message_queue(mq, mq_name)
+
+        else:
+            print("Ungültige Aktion.")
+            return
+    except Exception as e:
+        logging.error(f"Fehler in der Hauptfunktion: {e}")
+    finally:
+        pass
+
+if __name__ == "__main__":
+    main()